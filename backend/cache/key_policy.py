@@ -6,17 +6,73 @@ import json
 import math
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is a declared dependency
+    orjson = None  # type: ignore[assignment]
+
+
+_PLAIN_SCALARS = frozenset({str, int, bool, type(None)})
+
+
+def is_plain_json(obj: Any) -> bool:
+    """Return True when obj holds only types orjson encodes byte-identically to stdlib."""
+    obj_type = type(obj)
+    if obj_type in _PLAIN_SCALARS:
+        return True
+    if obj_type is dict:
+        return all(type(key) is str and is_plain_json(value) for key, value in obj.items())
+    if obj_type is list or obj_type is tuple:
+        return all(is_plain_json(item) for item in obj)
+    # Floats (exponent form, NaN/Infinity), datetimes, UUIDs, enums and subclasses diverge
+    return False
+
 
 def dumps_json(obj: Any) -> str:
     """Serialize JSON with stable ordering and ASCII-safe output."""
+    if orjson is not None and is_plain_json(obj):
+        try:
+            encoded = orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+        except TypeError:
+            # Ints beyond 64 bits: keep stdlib semantics
+            encoded = None
+        # orjson emits raw UTF-8 and DEL; only output without them matches the escaped stdlib form
+        if encoded is not None:
+            if encoded.isascii() and b"\x7f" not in encoded:
+                return encoded.decode("ascii")
+            return json.dumps(obj, sort_keys=True, ensure_ascii=True, separators=(",", ":"))
+
+    # Skipping the escape pass is safe when nothing needed escaping; verify on the result
+    text = json.dumps(obj, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    if text.isascii() and "\x7f" not in text:
+        return text
     return json.dumps(obj, sort_keys=True, ensure_ascii=True, separators=(",", ":"))
 
 
 def loads_json(text: str) -> Any:
     """Deserialize JSON text."""
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            # Stdlib also accepts NaN/Infinity literals and arbitrarily large ints
+            pass
     return json.loads(text)
 
 
+def equals_json(left: str | bytes, right: str | bytes) -> bool:
+    """Compare two dumps_json outputs without parsing them.
+
+    dumps_json is canonical (sorted keys, fixed separators, ASCII escapes), so
+    equal values serialize to identical text and byte equality suffices.
+    """
+    if isinstance(left, str):
+        left = left.encode("utf-8")
+    if isinstance(right, str):
+        right = right.encode("utf-8")
+    return left == right
+
+
 def _normalize_value(value: Any) -> Any:
     if value is None or isinstance(value, (bool, int, str)):
         return value
@@ -1,11 +1,24 @@
 """In-memory cache metrics collector (M6.3)."""
 from __future__ import annotations
 
+import bisect
+from collections import Counter
 from dataclasses import dataclass, field
 from typing import Any
 
+# Categories recorded on every cache operation resolve without strip()
+_NORMALIZED_CATEGORIES = {
+    "context": "context",
+    "tool": "tool",
+    "general": "general",
+    "": "general",
+}
+
 
 def _normalize_category(category: str) -> str:
+    known = _NORMALIZED_CATEGORIES.get(category)
+    if known is not None:
+        return known
     normalized = str(category).strip()
     return normalized or "general"
 
@@ -20,18 +33,25 @@ class CacheMetrics:
     deletes: int = 0
     errors: int = 0
 
-    category_hits: dict[str, int] = field(default_factory=dict)
-    category_misses: dict[str, int] = field(default_factory=dict)
+    category_hits: Counter[str] = field(default_factory=Counter)
+    category_misses: Counter[str] = field(default_factory=Counter)
 
-    def record_hit(self, category: str = "general") -> None:
+    # Kept sorted on first sight so summary() never re-sorts the category set
+    _sorted_categories: list[str] = field(default_factory=list, repr=False, compare=False)
+
+    def _track_category(self, category: str) -> str:
         category_name = _normalize_category(category)
+        if category_name not in self.category_hits and category_name not in self.category_misses:
+            bisect.insort(self._sorted_categories, category_name)
+        return category_name
+
+    def record_hit(self, category: str = "general") -> None:
         self.hits += 1
-        self.category_hits[category_name] = self.category_hits.get(category_name, 0) + 1
+        self.category_hits[self._track_category(category)] += 1
 
     def record_miss(self, category: str = "general") -> None:
-        category_name = _normalize_category(category)
         self.misses += 1
-        self.category_misses[category_name] = self.category_misses.get(category_name, 0) + 1
+        self.category_misses[self._track_category(category)] += 1
 
     def record_set(self) -> None:
         self.sets += 1
@@ -58,7 +78,6 @@ class CacheMetrics:
         return hits / total
 
     def summary(self) -> dict[str, Any]:
-        categories = sorted(set(self.category_hits.keys()) | set(self.category_misses.keys()))
         overall_rate = self.hit_rate()
 
         return {
@@ -77,7 +96,7 @@ class CacheMetrics:
                     "hit_rate": self.category_hit_rate(category),
                     "hit_rate_pct": f"{self.category_hit_rate(category):.2%}",
                 }
-                for category in categories
+                for category in self._sorted_categories
             },
         }
 
@@ -89,6 +108,7 @@ class CacheMetrics:
         self.errors = 0
         self.category_hits.clear()
         self.category_misses.clear()
+        self._sorted_categories.clear()
 
 
 _global_metrics = CacheMetrics()
@@ -1,6 +1,7 @@
 """Centralized cache settings (M6.6)."""
 from __future__ import annotations
 
+import functools
 import os
 from dataclasses import dataclass
 
@@ -26,13 +27,41 @@ class CacheSettings:
     tool_cache_ttl_seconds: int
 
 
+_TYPED_ENV_KEYS = frozenset({"CACHE_ENABLED", "REDIS_URL"})
+
+
+def _typed_settings_inputs() -> tuple[tuple[tuple[str, str], ...], tuple[str, int, int] | None]:
+    """Snapshot every input Settings() reads for the cache fields: env vars and the .env file."""
+    # Settings matches env names case-insensitively
+    env_items = tuple(
+        sorted((key, value) for key, value in os.environ.items() if key.upper() in _TYPED_ENV_KEYS)
+    )
+    dotenv_path = os.path.abspath(".env")
+    try:
+        stat = os.stat(dotenv_path)
+    except OSError:
+        return env_items, None
+    return env_items, (dotenv_path, stat.st_mtime_ns, stat.st_size)
+
+
+@functools.lru_cache(maxsize=32)
+def _load_typed_cache_fields(
+    settings_cls: object,
+    env_items: tuple[tuple[str, str], ...],
+    dotenv_signature: tuple[str, int, int] | None,
+) -> tuple[bool, str]:
+    # Settings() re-reads .env and validates every field; only repeat it when an input changed
+    settings = settings_cls()
+    return bool(settings.CACHE_ENABLED), str(settings.REDIS_URL)
+
+
 def load_cache_settings() -> CacheSettings:
     """Load cache settings from canonical typed settings + env TTL overrides."""
-    settings = Settings()
+    cache_enabled, redis_url = _load_typed_cache_fields(Settings, *_typed_settings_inputs())
 
     return CacheSettings(
-        cache_enabled=bool(settings.CACHE_ENABLED),
-        redis_url=str(settings.REDIS_URL),
+        cache_enabled=cache_enabled,
+        redis_url=redis_url,
         cache_default_ttl=_parse_positive_int(os.getenv("CACHE_DEFAULT_TTL"), default=3600),
         context_cache_ttl_seconds=_parse_positive_int(os.getenv("CONTEXT_CACHE_TTL_SECONDS"), default=3600),
         tool_cache_ttl_seconds=_parse_positive_int(os.getenv("TOOL_CACHE_TTL_SECONDS"), default=1800),
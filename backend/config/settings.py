@@ -1,5 +1,7 @@
 import os
+from collections.abc import Mapping
 from pathlib import Path
+from types import MappingProxyType
 from typing import TypedDict
 
 import httpx
@@ -10,6 +12,15 @@ from pydantic_settings.sources import PydanticBaseSettingsSource
 from backend.config.api_keys import ApiKeyRegistry, SUPPORTED_PROVIDERS
 
 
+# Read-only lookup built once instead of two sets per validated value
+_DEBUG_VALUES: Mapping[str, bool] = MappingProxyType(
+    {
+        **dict.fromkeys(("1", "true", "yes", "on", "dev", "debug", "development"), True),
+        **dict.fromkeys(("0", "false", "no", "off", "release", "prod", "production"), False),
+    }
+)
+
+
 class Settings(BaseSettings):
     APP_NAME: str = "JARVISv5"
     DEBUG: bool = True
@@ -49,20 +60,13 @@ class Settings(BaseSettings):
             return value
 
         if isinstance(value, str):
-            normalized = value.strip().lower()
-
-            true_values = {"1", "true", "yes", "on", "dev", "debug", "development"}
-            false_values = {"0", "false", "no", "off", "release", "prod", "production"}
-
-            if normalized in true_values:
-                return True
-            if normalized in false_values:
-                return False
+            parsed = _DEBUG_VALUES.get(value.strip().lower())
+            if parsed is not None:
+                return parsed
 
-            accepted = sorted(true_values | false_values)
             raise ValueError(
                 "Invalid DEBUG value. Accepted values: "
-                + ", ".join(accepted)
+                + ", ".join(sorted(_DEBUG_VALUES))
             )
 
         raise ValueError("Invalid DEBUG value type. Expected bool or string.")
@@ -1,5 +1,6 @@
 import json
 import time
+from datetime import datetime
 from typing import Any
 from uuid import uuid4
 from pathlib import Path
@@ -25,7 +26,7 @@ from backend.models.model_registry import ModelRegistry
 from backend.voice import FasterWhisperSTTProvider, PiperTTSProvider
 from backend.security.redactor import create_default_redactor
 from backend.retrieval.retrieval_types import RetrievalConfig
-from backend.workflow import ContextBuilderNode, LLMWorkerNode, RouterNode, SearchWebNode, ToolCallNode, ValidatorNode
+from backend.workflow import BaseNode, ContextBuilderNode, LLMWorkerNode, RouterNode, SearchWebNode, ToolCallNode, ValidatorNode
 from backend.workflow.dag_executor import DAGExecutor, WorkflowEdge, WorkflowGraph
 from backend.workflow.plan_compiler import build_constrained_plan, compile_plan_to_workflow_graph
 
@@ -48,19 +49,27 @@ class ControllerService:
         hardware_service: HardwareService | None = None,
         model_registry: ModelRegistry | None = None,
         generation_seed: int | None = None,
+        node_overrides: dict[str, BaseNode] | None = None,
     ) -> None:
         self.memory = memory_manager or MemoryManager()
         self.hardware = hardware_service or HardwareService()
         self.registry = model_registry or ModelRegistry()
         self.generation_seed = generation_seed
+        # Replaces registry entries by node id; the workflow graph itself is unchanged
+        self.node_overrides = dict(node_overrides or {})
+        # (timestamp, task_id, action_type, content, status) rows awaiting one batched insert
+        self._pending_dag_node_events: list[tuple[str, str, str, str, str]] = []
 
     def _log_state(self, task_id: str, state: ControllerState, status: str) -> None:
-        self.memory.log_decision(
-            task_id=task_id,
-            action_type="controller_state",
-            content=state.value,
-            status=status,
-        )
+        # Buffered node events and the state row share one commit
+        with self.memory.memory_batch():
+            self._flush_dag_node_events()
+            self.memory.log_decision(
+                task_id=task_id,
+                action_type="controller_state",
+                content=state.value,
+                status=status,
+            )
 
     def _log_dag_node_event(
         self,
@@ -89,13 +98,24 @@ class ControllerService:
         if start_offset_ns is not None:
             payload["start_offset_ns"] = int(start_offset_ns)
 
-        self.memory.log_decision(
-            task_id=task_id,
-            action_type="dag_node_event",
-            content=json.dumps(payload, sort_keys=True, separators=(",", ":")),
-            status=event_type,
+        self._pending_dag_node_events.append(
+            (
+                datetime.utcnow().isoformat(),
+                task_id,
+                "dag_node_event",
+                json.dumps(payload, sort_keys=True, separators=(",", ":")),
+                event_type,
+            )
         )
 
+    def _flush_dag_node_events(self) -> None:
+        """Write buffered node events in one transaction, ahead of any other decision."""
+        if not self._pending_dag_node_events:
+            return
+        pending = list(self._pending_dag_node_events)
+        self._pending_dag_node_events.clear()
+        self.memory.log_decisions(pending)
+
     def _fail(
         self,
         fsm: DeterministicFSM,
@@ -172,6 +192,7 @@ class ControllerService:
             "llm_worker": llm_worker_node,
             "validator": validator_node,
         }
+        node_registry.update(self.node_overrides)
         phase_to_nodes = {
             ControllerState.PLAN: {"router"},
             ControllerState.EXECUTE: {"context_builder", "search_web", "tool_call", "llm_worker"},
@@ -562,12 +583,14 @@ class ControllerService:
                             "subtask_output_empty": not bool(subtask_output),
                             "status": subtask_status,
                         }
-                        self.memory.log_decision(
-                            task_id=resolved_task_id,
-                            action_type="dag_subtask_event",
-                            content=json.dumps(subtask_payload, sort_keys=True, separators=(",", ":")),
-                            status=subtask_status,
-                        )
+                        with self.memory.memory_batch():
+                            self._flush_dag_node_events()
+                            self.memory.log_decision(
+                                task_id=resolved_task_id,
+                                action_type="dag_subtask_event",
+                                content=json.dumps(subtask_payload, sort_keys=True, separators=(",", ":")),
+                                status=subtask_status,
+                            )
                         if subtask_output:
                             aggregated_subtask_outputs.append(subtask_output)
 
@@ -1,123 +1,255 @@
 import os
 import sqlite3
-from contextlib import closing
+import threading
+import weakref
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
 from datetime import datetime
 
+from .sqlite_pragmas import build_pragma_statements
+
+_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS decisions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    action_type TEXT NOT NULL,
+    content TEXT NOT NULL,
+    status TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tool_calls (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    decision_id INTEGER NOT NULL,
+    tool_name TEXT NOT NULL,
+    params TEXT NOT NULL,
+    result TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    FOREIGN KEY(decision_id) REFERENCES decisions(id)
+);
+CREATE TABLE IF NOT EXISTS validations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    decision_id INTEGER NOT NULL,
+    validator_type TEXT NOT NULL,
+    result TEXT NOT NULL,
+    notes TEXT NOT NULL,
+    FOREIGN KEY(decision_id) REFERENCES decisions(id)
+);
+CREATE INDEX IF NOT EXISTS idx_decisions_task_id ON decisions(task_id);
+CREATE INDEX IF NOT EXISTS idx_decisions_action_type ON decisions(action_type);
+CREATE INDEX IF NOT EXISTS idx_decisions_id_desc ON decisions(id DESC);
+CREATE INDEX IF NOT EXISTS idx_decisions_task_action_id ON decisions(task_id, action_type, id);
+CREATE INDEX IF NOT EXISTS idx_tool_calls_decision_id ON tool_calls(decision_id);
+CREATE INDEX IF NOT EXISTS idx_tool_calls_tool_name ON tool_calls(tool_name);
+CREATE INDEX IF NOT EXISTS idx_tool_calls_id_desc ON tool_calls(id DESC);
+"""
+
+# Single and batched inserts share one SQL text, so both hit the same cached prepared statement
+_INSERT_DECISION_SQL = (
+    "INSERT INTO decisions (timestamp, task_id, action_type, content, status) VALUES (?, ?, ?, ?, ?)"
+)
+_INSERT_TOOL_CALL_SQL = (
+    "INSERT INTO tool_calls (decision_id, tool_name, params, result, timestamp) VALUES (?, ?, ?, ?, ?)"
+)
+_INSERT_VALIDATION_SQL = (
+    "INSERT INTO validations (decision_id, validator_type, result, notes) VALUES (?, ?, ?, ?)"
+)
+
+# External-content trigram indexes: substring MATCH (like LIKE '%q%') without a table scan.
+# Triggers keep them in step with the base tables; 'rebuild' backfills rows written before.
+_FTS_SCHEMAS = (
+    (
+        "decisions_fts",
+        """
+CREATE VIRTUAL TABLE IF NOT EXISTS decisions_fts USING fts5(
+    content, action_type, status, content='decisions', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS decisions_fts_ai AFTER INSERT ON decisions BEGIN
+    INSERT INTO decisions_fts(rowid, content, action_type, status)
+    VALUES (new.id, new.content, new.action_type, new.status);
+END;
+CREATE TRIGGER IF NOT EXISTS decisions_fts_ad AFTER DELETE ON decisions BEGIN
+    INSERT INTO decisions_fts(decisions_fts, rowid, content, action_type, status)
+    VALUES ('delete', old.id, old.content, old.action_type, old.status);
+END;
+CREATE TRIGGER IF NOT EXISTS decisions_fts_au AFTER UPDATE ON decisions BEGIN
+    INSERT INTO decisions_fts(decisions_fts, rowid, content, action_type, status)
+    VALUES ('delete', old.id, old.content, old.action_type, old.status);
+    INSERT INTO decisions_fts(rowid, content, action_type, status)
+    VALUES (new.id, new.content, new.action_type, new.status);
+END;
+INSERT INTO decisions_fts(decisions_fts) VALUES ('rebuild');
+""",
+    ),
+    (
+        "tool_calls_fts",
+        """
+CREATE VIRTUAL TABLE IF NOT EXISTS tool_calls_fts USING fts5(
+    tool_name, params, result, content='tool_calls', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS tool_calls_fts_ai AFTER INSERT ON tool_calls BEGIN
+    INSERT INTO tool_calls_fts(rowid, tool_name, params, result)
+    VALUES (new.id, new.tool_name, new.params, new.result);
+END;
+CREATE TRIGGER IF NOT EXISTS tool_calls_fts_ad AFTER DELETE ON tool_calls BEGIN
+    INSERT INTO tool_calls_fts(tool_calls_fts, rowid, tool_name, params, result)
+    VALUES ('delete', old.id, old.tool_name, old.params, old.result);
+END;
+CREATE TRIGGER IF NOT EXISTS tool_calls_fts_au AFTER UPDATE ON tool_calls BEGIN
+    INSERT INTO tool_calls_fts(tool_calls_fts, rowid, tool_name, params, result)
+    VALUES ('delete', old.id, old.tool_name, old.params, old.result);
+    INSERT INTO tool_calls_fts(rowid, tool_name, params, result)
+    VALUES (new.id, new.tool_name, new.params, new.result);
+END;
+INSERT INTO tool_calls_fts(tool_calls_fts) VALUES ('rebuild');
+""",
+    ),
+)
+
+
+def _fts_phrase(query_text: str) -> str | None:
+    """Quote a query as an FTS5 phrase, or None when only the LIKE scan matches it exactly."""
+    # Trigrams need 3+ characters, and LIKE treats % and _ as wildcards
+    if len(query_text) < 3 or "%" in query_text or "_" in query_text:
+        return None
+    return '"' + query_text.replace('"', '""') + '"'
+
 
 class EpisodicMemory:
-    def __init__(self, db_path: str = "data/episodic/trace.db") -> None:
+    def __init__(
+        self,
+        db_path: str = "data/episodic/trace.db",
+        pragmas: Mapping[str, object] | None = None,
+    ) -> None:
         self.db_path = db_path
-        db_dir = os.path.dirname(self.db_path)
-        if db_dir:
-            os.makedirs(db_dir, exist_ok=True)
+        self._pragma_statements = build_pragma_statements(pragmas)
+        # "file:" URIs (e.g. file:name?mode=memory&cache=shared) are opened as-is
+        self._is_uri = self.db_path.startswith("file:")
+        if not self._is_uri:
+            db_dir = os.path.dirname(self.db_path)
+            if db_dir:
+                os.makedirs(db_dir, exist_ok=True)
+        # One long-lived connection serves every log_* and search_* call. It also keeps a
+        # shared in-memory database alive, which lives only while a connection is open.
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+        self._conn = self._connect(check_same_thread=False)
+        self._finalizer = weakref.finalize(self, self._conn.close)
         self._init_db()
 
-    def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.db_path)
+    def connect(self) -> sqlite3.Connection:
+        """Open a new connection to the trace database; the caller closes it."""
+        return self._connect()
+
+    def close(self) -> None:
+        """Close the shared connection; also runs at garbage collection and interpreter exit."""
+        with self._lock:
+            self._finalizer()
+
+    def _connect(self, check_same_thread: bool = True) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, uri=self._is_uri, check_same_thread=check_same_thread)
         conn.execute("PRAGMA foreign_keys = ON")
+        for statement in self._pragma_statements:
+            conn.execute(statement)
         return conn
 
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Run the enclosed log_* calls in one transaction and commit them together."""
+        with self._lock:
+            if self._batch_depth:
+                # Nested batches join the outer transaction
+                self._batch_depth += 1
+                try:
+                    yield
+                finally:
+                    self._batch_depth -= 1
+                return
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._batch_depth = 1
+            try:
+                yield
+            except BaseException:
+                self._conn.rollback()
+                raise
+            else:
+                self._conn.commit()
+            finally:
+                self._batch_depth = 0
+
+    @contextmanager
+    def _write_connection(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            if self._batch_depth:
+                yield self._conn
+                return
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.rollback()
+                raise
+            else:
+                self._conn.commit()
+
     def _init_db(self) -> None:
-        with closing(self._connect()) as conn:
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS decisions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp TEXT NOT NULL,
-                    task_id TEXT NOT NULL,
-                    action_type TEXT NOT NULL,
-                    content TEXT NOT NULL,
-                    status TEXT NOT NULL
-                )
-                """
-            )
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS tool_calls (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    decision_id INTEGER NOT NULL,
-                    tool_name TEXT NOT NULL,
-                    params TEXT NOT NULL,
-                    result TEXT NOT NULL,
-                    timestamp TEXT NOT NULL,
-                    FOREIGN KEY(decision_id) REFERENCES decisions(id)
-                )
-                """
-            )
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS validations (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    decision_id INTEGER NOT NULL,
-                    validator_type TEXT NOT NULL,
-                    result TEXT NOT NULL,
-                    notes TEXT NOT NULL,
-                    FOREIGN KEY(decision_id) REFERENCES decisions(id)
-                )
-                """
-            )
+        with self._lock:
+            # One explicit transaction: sqlite3 leaves DDL in autocommit, one sync per statement
+            self._conn.executescript(f"BEGIN IMMEDIATE;{_SCHEMA_SQL}COMMIT;")
+            self._fts_enabled = self._init_fts(self._conn)
 
-            conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_decisions_task_id ON decisions(task_id)"
-            )
-            conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_decisions_action_type ON decisions(action_type)"
-            )
-            conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_decisions_id_desc ON decisions(id DESC)"
-            )
-            conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_tool_calls_decision_id ON tool_calls(decision_id)"
-            )
-            conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_tool_calls_tool_name ON tool_calls(tool_name)"
-            )
-            conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_tool_calls_id_desc ON tool_calls(id DESC)"
+    def _init_fts(self, conn: sqlite3.Connection) -> bool:
+        existing = {
+            row[0]
+            for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name IN (?, ?)",
+                tuple(name for name, _ in _FTS_SCHEMAS),
             )
-
-            conn.commit()
+        }
+        script = "".join(sql for name, sql in _FTS_SCHEMAS if name not in existing)
+        if not script:
+            return True
+        try:
+            conn.executescript(f"BEGIN IMMEDIATE;{script}COMMIT;")
+        except sqlite3.OperationalError:
+            # SQLite without FTS5 or the trigram tokenizer (< 3.34) keeps the LIKE scan
+            conn.rollback()
+            return False
+        return True
 
     def log_decision(self, task_id: str, action_type: str, content: str, status: str) -> int:
         timestamp = datetime.utcnow().isoformat()
-        with closing(self._connect()) as conn:
-            cursor = conn.execute(
-                """
-                INSERT INTO decisions (timestamp, task_id, action_type, content, status)
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (timestamp, task_id, action_type, content, status),
-            )
-            conn.commit()
+        with self._write_connection() as conn:
+            cursor = conn.execute(_INSERT_DECISION_SQL, (timestamp, task_id, action_type, content, status))
             if cursor.lastrowid is None:
                 raise RuntimeError("Failed to insert decision record")
             return int(cursor.lastrowid)
 
+    def log_decisions(self, decisions: list[tuple[str, str, str, str, str]]) -> int:
+        """Insert (timestamp, task_id, action_type, content, status) rows in one transaction."""
+        if not decisions:
+            return 0
+        with self._write_connection() as conn:
+            conn.executemany(_INSERT_DECISION_SQL, decisions)
+        return len(decisions)
+
     def log_tool_call(self, decision_id: int, tool_name: str, params: str, result: str) -> int:
         timestamp = datetime.utcnow().isoformat()
-        with closing(self._connect()) as conn:
-            cursor = conn.execute(
-                """
-                INSERT INTO tool_calls (decision_id, tool_name, params, result, timestamp)
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (decision_id, tool_name, params, result, timestamp),
-            )
-            conn.commit()
+        with self._write_connection() as conn:
+            cursor = conn.execute(_INSERT_TOOL_CALL_SQL, (decision_id, tool_name, params, result, timestamp))
             if cursor.lastrowid is None:
                 raise RuntimeError("Failed to insert tool call record")
             return int(cursor.lastrowid)
 
+    def log_tool_calls(self, tool_calls: list[tuple[int, str, str, str, str]]) -> int:
+        """Insert (decision_id, tool_name, params, result, timestamp) rows in one transaction."""
+        if not tool_calls:
+            return 0
+        with self._write_connection() as conn:
+            conn.executemany(_INSERT_TOOL_CALL_SQL, tool_calls)
+        return len(tool_calls)
+
     def log_validation(self, decision_id: int, validator_type: str, result: str, notes: str) -> int:
-        with closing(self._connect()) as conn:
-            cursor = conn.execute(
-                """
-                INSERT INTO validations (decision_id, validator_type, result, notes)
-                VALUES (?, ?, ?, ?)
-                """,
-                (decision_id, validator_type, result, notes),
-            )
-            conn.commit()
+        with self._write_connection() as conn:
+            cursor = conn.execute(_INSERT_VALIDATION_SQL, (decision_id, validator_type, result, notes))
             if cursor.lastrowid is None:
                 raise RuntimeError("Failed to insert validation record")
             return int(cursor.lastrowid)
@@ -139,24 +271,29 @@ class EpisodicMemory:
 
         like_query = f"%{query_text}%"
         sql = """
-            SELECT id, timestamp, task_id, action_type, content, status
-            FROM decisions
+            SELECT d.id, d.timestamp, d.task_id, d.action_type, d.content, d.status
+            FROM decisions d
             WHERE (
-                content LIKE ? OR
-                action_type LIKE ? OR
-                status LIKE ?
+                d.content LIKE ? OR
+                d.action_type LIKE ? OR
+                d.status LIKE ?
             )
         """
         params: list[object] = [like_query, like_query, like_query]
+        phrase = _fts_phrase(query_text) if self._fts_enabled else None
+        if phrase is not None:
+            # The trigram index narrows candidates; LIKE keeps its ASCII-only case folding authoritative
+            sql += " AND d.id IN (SELECT rowid FROM decisions_fts WHERE decisions_fts MATCH ?)"
+            params.append(phrase)
         if task_id is not None:
-            sql += " AND task_id = ?"
+            sql += " AND d.task_id = ?"
             params.append(task_id)
 
-        sql += " ORDER BY id DESC LIMIT ?"
+        sql += " ORDER BY d.id DESC LIMIT ?"
         params.append(limit_int)
 
-        with closing(self._connect()) as conn:
-            rows = conn.execute(sql, params).fetchall()
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
 
         return [
             {
@@ -197,6 +334,10 @@ class EpisodicMemory:
             )
         """
         params: list[object] = [like_query, like_query, like_query]
+        phrase = _fts_phrase(query_text) if self._fts_enabled else None
+        if phrase is not None:
+            sql += " AND tc.id IN (SELECT rowid FROM tool_calls_fts WHERE tool_calls_fts MATCH ?)"
+            params.append(phrase)
         if task_id is not None:
             sql += " AND d.task_id = ?"
             params.append(task_id)
@@ -204,8 +345,8 @@ class EpisodicMemory:
         sql += " ORDER BY tc.id DESC LIMIT ?"
         params.append(limit_int)
 
-        with closing(self._connect()) as conn:
-            rows = conn.execute(sql, params).fetchall()
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
 
         return [
             {
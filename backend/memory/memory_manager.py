@@ -1,3 +1,5 @@
+from collections.abc import Mapping
+from contextlib import AbstractContextManager
 from typing import Any
 
 from .episodic_db import EpisodicMemory
@@ -13,8 +15,9 @@ class MemoryManager:
         working_archive_path: str = "data/archives",
         semantic_db_path: str = "data/semantic/metadata.db",
         embedding_model: Any = None,
+        sqlite_pragmas: Mapping[str, object] | None = None,
     ) -> None:
-        self.episodic = EpisodicMemory(db_path=episodic_db_path)
+        self.episodic = EpisodicMemory(db_path=episodic_db_path, pragmas=sqlite_pragmas)
         self.working = WorkingStateManager(
             base_path=working_base_path,
             archive_path=working_archive_path,
@@ -22,14 +25,24 @@ class MemoryManager:
         self.semantic = SemanticMemory(
             db_path=semantic_db_path,
             embedding_model=embedding_model,
+            pragmas=sqlite_pragmas,
         )
 
     def log_decision(self, task_id: str, action_type: str, content: str, status: str) -> int:
         return self.episodic.log_decision(task_id, action_type, content, status)
 
+    def log_decisions(self, decisions: list[tuple[str, str, str, str, str]]) -> int:
+        return self.episodic.log_decisions(decisions)
+
     def log_tool_call(self, decision_id: int, tool_name: str, params: str, result: str) -> int:
         return self.episodic.log_tool_call(decision_id, tool_name, params, result)
 
+    def log_tool_calls(self, tool_calls: list[tuple[int, str, str, str, str]]) -> int:
+        return self.episodic.log_tool_calls(tool_calls)
+
+    def memory_batch(self) -> AbstractContextManager[None]:
+        return self.episodic.batch()
+
     def create_task(self, task_id: str, goal: str, steps: list[str]) -> dict:
         return self.working.create_task(task_id, goal, steps)
 
@@ -1,6 +1,7 @@
 import json
 import os
 import sqlite3
+from collections.abc import Mapping
 from contextlib import closing
 from math import isfinite
 from typing import Any
@@ -8,6 +9,8 @@ from typing import Any
 import faiss
 import numpy as np
 
+from .sqlite_pragmas import build_pragma_statements
+
 
 def _l2_distance_to_similarity(distance: float) -> float:
     """Convert L2 distance to normalized similarity score in [0, 1]."""
@@ -30,8 +33,10 @@ class SemanticMemory:
         db_path: str = "data/semantic/metadata.db",
         embedding_model: Any = None,
         index_path: str | None = None,
+        pragmas: Mapping[str, object] | None = None,
     ) -> None:
         self.db_path = db_path
+        self._pragma_statements = build_pragma_statements(pragmas)
         db_dir = os.path.dirname(self.db_path)
         if db_dir:
             os.makedirs(db_dir, exist_ok=True)
@@ -67,7 +72,10 @@ class SemanticMemory:
         return len(probe_vector)
 
     def _connect(self) -> sqlite3.Connection:
-        return sqlite3.connect(self.db_path)
+        conn = sqlite3.connect(self.db_path)
+        for statement in self._pragma_statements:
+            conn.execute(statement)
+        return conn
 
     def _init_db(self) -> None:
         with closing(self._connect()) as conn:
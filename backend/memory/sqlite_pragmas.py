@@ -0,0 +1,18 @@
+import re
+from collections.abc import Mapping
+
+_PRAGMA_TOKEN_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$|^-?[0-9]+$")
+
+
+def build_pragma_statements(pragmas: Mapping[str, object] | None) -> tuple[str, ...]:
+    """Validate connection pragmas once and render them as PRAGMA statements."""
+    if not pragmas:
+        return ()
+    statements: list[str] = []
+    for name, value in pragmas.items():
+        value_text = str(value)
+        # PRAGMA does not accept bound parameters, so only plain identifiers and integers pass
+        if not _PRAGMA_TOKEN_RE.match(name) or not _PRAGMA_TOKEN_RE.match(value_text):
+            raise ValueError(f"Invalid SQLite pragma: {name}={value_text}")
+        statements.append(f"PRAGMA {name} = {value_text}")
+    return tuple(statements)
@@ -1,11 +1,36 @@
 from __future__ import annotations
 
+import re
 from datetime import datetime, timezone
 from math import exp
-from typing import Any, Callable
+from typing import Any, Callable, NamedTuple
+
+import numpy as np
 
 from backend.retrieval.retrieval_types import RetrievalConfig, RetrievalResult, SourceType
 
+_SOURCE_PRIORITY = {
+    SourceType.WORKING_STATE: 0,
+    SourceType.SEMANTIC: 1,
+    SourceType.EPISODIC: 2,
+}
+
+# Naive or UTC-suffixed ISO-8601 values that numpy parses exactly like datetime.fromisoformat;
+# anything else (other offsets, week dates, ...) goes through _timestamp_recency per row.
+_UTC_ISO_TIMESTAMP = re.compile(
+    r"((?!0000)\d{4}-\d{2}-\d{2}(?:[T ]\d{2}(?::\d{2}(?::\d{2}(?:\.\d{1,6})?)?)?)?)(?:Z|[+-]00:00)?"
+)
+
+
+class _Candidate(NamedTuple):
+    source: SourceType
+    content: str
+    relevance_score: float
+    recency_score: float
+    task_id: str | None
+    timestamp: str | None
+    metadata: dict[str, Any]
+
 
 class HybridRetriever:
     def __init__(
@@ -43,26 +68,38 @@ class HybridRetriever:
         cap = min(requested_limit, config.max_results)
         candidate_pool = max(cap, config.max_results)
 
-        results: list[RetrievalResult] = []
-        results.extend(self._retrieve_working_state(query_text, task_id, config))
-        results.extend(self._retrieve_semantic(query_text, task_id, config, candidate_pool))
-        results.extend(self._retrieve_episodic(query_text, task_id, config, candidate_pool))
+        candidates: list[_Candidate] = []
+        candidates.extend(self._retrieve_working_state(query_text, task_id, config))
+        candidates.extend(self._retrieve_semantic(query_text, task_id, config, candidate_pool))
+        candidates.extend(self._retrieve_episodic(query_text, task_id, config, candidate_pool))
+        if not candidates:
+            return []
 
-        filtered = [
-            item
-            for item in results
-            if item.final_score >= config.min_final_score_threshold
-        ]
+        recency = self._recency_scores(candidates, config)
+        final = self._final_scores(candidates, recency, config)
+        kept = self._top_indices(final, np.flatnonzero(final >= config.min_final_score_threshold), cap)
+        ordered = kept[self._rank_deterministically(candidates, final, kept)]
 
-        ordered = self._rank_deterministically(filtered)
-        return ordered[:cap]
+        return [
+            RetrievalResult.from_scores(
+                source=candidates[index].source,
+                content=candidates[index].content,
+                relevance_score=candidates[index].relevance_score,
+                recency_score=float(recency[index]),
+                config=config,
+                task_id=candidates[index].task_id,
+                timestamp=candidates[index].timestamp,
+                metadata=candidates[index].metadata,
+            )
+            for index in ordered[:cap].tolist()
+        ]
 
     def _retrieve_working_state(
         self,
         query: str,
         task_id: str | None,
         config: RetrievalConfig,
-    ) -> list[RetrievalResult]:
+    ) -> list[_Candidate]:
         if not task_id:
             return []
 
@@ -82,7 +119,7 @@ class HybridRetriever:
 
         query_lower = query.lower()
         newest_index = len(messages) - 1
-        results: list[RetrievalResult] = []
+        results: list[_Candidate] = []
         for idx, message in enumerate(messages):
             content = str(message.get("content", ""))
             content_lower = content.lower()
@@ -96,13 +133,13 @@ class HybridRetriever:
             recency = self._decay_from_steps(age, config.ws_decay_tau)
 
             results.append(
-                RetrievalResult.from_scores(
+                _Candidate(
                     source=SourceType.WORKING_STATE,
                     content=content,
                     relevance_score=relevance,
                     recency_score=recency,
-                    config=config,
                     task_id=task_id,
+                    timestamp=None,
                     metadata={
                         "role": str(message.get("role", "")),
                         "position": idx,
@@ -118,28 +155,22 @@ class HybridRetriever:
         task_id: str | None,
         config: RetrievalConfig,
         candidate_pool: int,
-    ) -> list[RetrievalResult]:
+    ) -> list[_Candidate]:
         rows = self.semantic_store.search_text(query, top_k=candidate_pool)
-        results: list[RetrievalResult] = []
+        results: list[_Candidate] = []
         for row in rows:
             if not isinstance(row, dict):
                 continue
             metadata = row.get("metadata", {})
             metadata_dict = metadata if isinstance(metadata, dict) else {}
             timestamp = metadata_dict.get("timestamp")
-            recency = self._timestamp_recency(
-                timestamp,
-                default_score=config.semantic_recency_default,
-                tau_hours=config.time_decay_tau_hours,
-            )
 
             results.append(
-                RetrievalResult.from_scores(
+                _Candidate(
                     source=SourceType.SEMANTIC,
                     content=str(row.get("text", "")),
                     relevance_score=float(row.get("similarity_score", 0.0)),
-                    recency_score=recency,
-                    config=config,
+                    recency_score=config.semantic_recency_default,
                     task_id=task_id,
                     timestamp=timestamp if isinstance(timestamp, str) else None,
                     metadata={
@@ -157,8 +188,8 @@ class HybridRetriever:
         task_id: str | None,
         config: RetrievalConfig,
         candidate_pool: int,
-    ) -> list[RetrievalResult]:
-        results: list[RetrievalResult] = []
+    ) -> list[_Candidate]:
+        results: list[_Candidate] = []
 
         decisions = self.episodic_memory.search_decisions(
             query,
@@ -169,18 +200,12 @@ class HybridRetriever:
             if not isinstance(row, dict):
                 continue
             timestamp = row.get("timestamp")
-            recency = self._timestamp_recency(
-                timestamp,
-                default_score=config.episodic_recency_default,
-                tau_hours=config.time_decay_tau_hours,
-            )
             results.append(
-                RetrievalResult.from_scores(
+                _Candidate(
                     source=SourceType.EPISODIC,
                     content=str(row.get("content", "")),
                     relevance_score=config.episodic_decision_relevance,
-                    recency_score=recency,
-                    config=config,
+                    recency_score=config.episodic_recency_default,
                     task_id=str(row.get("task_id")) if row.get("task_id") is not None else task_id,
                     timestamp=timestamp if isinstance(timestamp, str) else None,
                     metadata={
@@ -201,19 +226,13 @@ class HybridRetriever:
             if not isinstance(row, dict):
                 continue
             timestamp = row.get("timestamp")
-            recency = self._timestamp_recency(
-                timestamp,
-                default_score=config.episodic_recency_default,
-                tau_hours=config.time_decay_tau_hours,
-            )
             content = f"{row.get('tool_name', '')} {row.get('params', '')} {row.get('result', '')}".strip()
             results.append(
-                RetrievalResult.from_scores(
+                _Candidate(
                     source=SourceType.EPISODIC,
                     content=content,
                     relevance_score=config.episodic_toolcall_relevance,
-                    recency_score=recency,
-                    config=config,
+                    recency_score=config.episodic_recency_default,
                     task_id=str(row.get("task_id")) if row.get("task_id") is not None else task_id,
                     timestamp=timestamp if isinstance(timestamp, str) else None,
                     metadata={
@@ -255,10 +274,81 @@ class HybridRetriever:
         except Exception:
             return default_score
 
+    def _recency_scores(self, candidates: list[_Candidate], config: RetrievalConfig) -> np.ndarray:
+        recency = np.fromiter(
+            (item.recency_score for item in candidates),
+            dtype=np.float64,
+            count=len(candidates),
+        )
+        parsed_indices: list[int] = []
+        parsed_values: list[str] = []
+        for index, item in enumerate(candidates):
+            if item.timestamp is None or not item.timestamp.strip():
+                continue
+            match = _UTC_ISO_TIMESTAMP.fullmatch(item.timestamp)
+            if match is not None:
+                parsed_indices.append(index)
+                parsed_values.append(match.group(1))
+                continue
+            recency[index] = self._timestamp_recency(
+                item.timestamp,
+                default_score=item.recency_score,
+                tau_hours=config.time_decay_tau_hours,
+            )
+        if not parsed_indices:
+            return recency
+
+        try:
+            stamps = np.array(parsed_values, dtype="datetime64[us]")
+        except ValueError:
+            for index in parsed_indices:
+                recency[index] = self._timestamp_recency(
+                    candidates[index].timestamp,
+                    default_score=candidates[index].recency_score,
+                    tau_hours=config.time_decay_tau_hours,
+                )
+            return recency
+
+        now = self.now_provider()
+        if now.tzinfo is not None:
+            now = now.astimezone(timezone.utc).replace(tzinfo=None)
+        age_seconds = np.maximum((np.datetime64(now, "us") - stamps).astype(np.int64) / 1e6, 0.0)
+        age_steps = np.trunc((age_seconds / 3600.0) * 1000)
+        recency[parsed_indices] = np.clip(
+            np.exp(-age_steps / (config.time_decay_tau_hours * 1000.0)),
+            0.0,
+            1.0,
+        )
+        return recency
+
     @staticmethod
-    def _stable_id(result: RetrievalResult) -> int:
+    def _final_scores(
+        candidates: list[_Candidate],
+        recency: np.ndarray,
+        config: RetrievalConfig,
+    ) -> np.ndarray:
+        relevance = np.clip(
+            np.fromiter((item.relevance_score for item in candidates), dtype=np.float64, count=len(candidates)),
+            0.0,
+            1.0,
+        )
+        recency = np.clip(recency, 0.0, 1.0)
+        weighted = (relevance * config.relevance_weight) + (recency * config.recency_weight)
+        return np.clip(weighted / (config.relevance_weight + config.recency_weight), 0.0, 1.0)
+
+    @staticmethod
+    def _top_indices(final: np.ndarray, indices: np.ndarray, cap: int) -> np.ndarray:
+        if indices.size <= cap:
+            return indices
+        # Keep everything tied with the cap-th best score so the tie-break ranking stays exact.
+        scores = final[indices]
+        cutoff = np.partition(scores, indices.size - cap)[indices.size - cap]
+        return indices[scores >= cutoff]
+
+    @staticmethod
+    def _stable_id(metadata: dict[str, Any]) -> int:
         for key in ("vector_id", "id", "decision_id", "position"):
-            value = result.metadata.get(key)
+            value = metadata.get(key)
             try:
                 if value is not None:
                     return int(value)
@@ -266,18 +356,19 @@ class HybridRetriever:
                 continue
         return 2**31 - 1
 
-    def _rank_deterministically(self, results: list[RetrievalResult]) -> list[RetrievalResult]:
-        source_priority = {
-            SourceType.WORKING_STATE: 0,
-            SourceType.SEMANTIC: 1,
-            SourceType.EPISODIC: 2,
-        }
-        return sorted(
-            results,
-            key=lambda item: (
-                -float(item.final_score),
-                source_priority.get(item.source, 99),
-                self._stable_id(item),
-                item.content,
-            ),
+    def _rank_deterministically(
+        self,
+        candidates: list[_Candidate],
+        final: np.ndarray,
+        indices: np.ndarray,
+    ) -> np.ndarray:
+        selected = [candidates[index] for index in indices.tolist()]
+        priority = np.fromiter(
+            (_SOURCE_PRIORITY.get(item.source, 99) for item in selected),
+            dtype=np.int64,
+            count=len(selected),
         )
+        stable_ids = np.array([self._stable_id(item.metadata) for item in selected], dtype=object)
+        contents = np.array([item.content for item in selected], dtype=object)
+        # np.lexsort sorts by the last key first: score desc, source, stable id, content.
+        return np.lexsort((contents, stable_ids, priority, -final[indices]))
@@ -4,11 +4,23 @@ Security Audit Logger - Record security events for compliance and debugging.
 from __future__ import annotations
 
 import json
-from dataclasses import asdict, dataclass
+import mmap
+import os
+import threading
+import time
+import weakref
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from enum import Enum
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
+
+from backend.cache.key_policy import is_plain_json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is a declared dependency
+    orjson = None  # type: ignore[assignment]
 
 
 class SecurityEventType(str, Enum):
@@ -24,7 +36,7 @@ class SecurityEventType(str, Enum):
     SUSPICIOUS_PATTERN = "suspicious_pattern"
 
 
-@dataclass
+@dataclass(slots=True)
 class SecurityEvent:
     """A security event record."""
 
@@ -36,18 +48,170 @@ class SecurityEvent:
     user_id: str | None = None
 
 
+# Fixed record schema, in SecurityEvent field order
+_EVENT_LINE_TEMPLATE = (
+    b'{"event_type":%b,"timestamp":%b,"context":%b,"severity":%b,"task_id":%b,"user_id":%b}\n'
+)
+
+
+def _dumps_value(value: Any) -> bytes:
+    if orjson is not None and is_plain_json(value):
+        try:
+            encoded = orjson.dumps(value)
+        except TypeError:
+            # Ints beyond 64 bits: keep stdlib semantics
+            encoded = None
+        # orjson emits raw UTF-8 and DEL; only output without them matches the escaped stdlib form
+        if encoded is not None and encoded.isascii() and b"\x7f" not in encoded:
+            return encoded
+    # Caller-supplied context may hold int keys, big ints or NaN, which stdlib writes as before
+    return json.dumps(value, ensure_ascii=True, separators=(",", ":")).encode("ascii")
+
+
+def _render_event(event: SecurityEvent) -> bytes:
+    """Render one event as a JSONL line without building an intermediate record dict."""
+    return _EVENT_LINE_TEMPLATE % (
+        _dumps_value(event.event_type),
+        _dumps_value(event.timestamp),
+        _dumps_value(event.context),
+        _dumps_value(event.severity),
+        _dumps_value(event.task_id),
+        _dumps_value(event.user_id),
+    )
+
+
+def _loads_line(line: bytes) -> dict[str, Any]:
+    if orjson is not None:
+        try:
+            return orjson.loads(line)
+        except orjson.JSONDecodeError:
+            # Lines written before the orjson writer may carry stdlib-only NaN/Infinity literals
+            pass
+    return json.loads(line)
+
+
+def _parse_timestamp(timestamp: str) -> datetime:
+    """Parse an ISO-8601 event timestamp, treating naive values as UTC."""
+    # fromisoformat is implemented in C and accepts the "Z" suffix on Python 3.11+
+    parsed = datetime.fromisoformat(timestamp)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _iter_lines(log_path: Path) -> Iterator[bytes]:
+    """Yield raw JSONL lines from a memory-mapped view of the log file."""
+    with open(log_path, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            position = 0
+            size = len(view)
+            while position < size:
+                newline = view.find(b"\n", position)
+                end = size if newline == -1 else newline
+                yield view[position:end]
+                position = end + 1
+
+
+def _write_lines(log_path: Path, lines: list[bytes]) -> None:
+    """Append buffered JSONL lines with a single write, then clear the buffer."""
+    if not lines:
+        return
+    with open(log_path, "ab") as handle:
+        handle.write(b"".join(lines))
+    lines.clear()
+
+
+def _flush_pending(
+    log_path: Path,
+    lines: list[bytes],
+    lock: threading.Lock,
+    pending: threading.Event,
+) -> None:
+    with lock:
+        _write_lines(log_path, lines)
+    # Wake the delay flusher so it observes the dead logger and exits
+    pending.set()
+
+
+def _flush_after_delay(
+    logger_ref: weakref.ref[SecurityAuditLogger],
+    pending: threading.Event,
+    delay: float,
+) -> None:
+    """Background loop: flush a logger ``delay`` seconds after events start pending."""
+    while True:
+        pending.wait()
+        time.sleep(delay)
+        logger = logger_ref()
+        if logger is None:
+            return
+        logger.flush()
+        del logger
+
+
 class SecurityAuditLogger:
-    """Log security events to file."""
+    """Log security events to file.
+
+    Events are buffered and appended in batches once ``flush_threshold`` bytes
+    are pending, or by a background thread ``max_flush_delay`` seconds after
+    the first pending event. Call ``flush()`` when events must be on disk;
+    ``read_events()`` flushes first, and pending events are also written when
+    the logger is collected or the interpreter exits.
+    """
 
-    def __init__(self, log_path: str | Path) -> None:
+    def __init__(
+        self,
+        log_path: str | Path,
+        flush_threshold: int = 65536,
+        max_flush_delay: float = 1.0,
+    ) -> None:
         self.log_path = Path(log_path)
         self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        self._flush_threshold = flush_threshold
+        self._max_flush_delay = max_flush_delay
+        self._buffer: list[bytes] = []
+        self._buffer_bytes = 0
+        self._lock = threading.Lock()
+        self._pending = threading.Event()
+        self._flusher: threading.Thread | None = None
+        # Holds no reference to self, so dropping the logger still writes its pending events
+        self._finalizer = weakref.finalize(
+            self, _flush_pending, self.log_path, self._buffer, self._lock, self._pending
+        )
 
     def log_event(self, event: SecurityEvent) -> None:
-        """Append one security event to the JSONL log file."""
-        with open(self.log_path, "a", encoding="utf-8", newline="\n") as handle:
-            handle.write(json.dumps(asdict(event), ensure_ascii=True) + "\n")
-            handle.flush()
+        """Buffer one security event for the JSONL log file."""
+        line = _render_event(event)
+        with self._lock:
+            if not self._buffer:
+                self._start_flusher()
+                self._pending.set()
+            self._buffer.append(line)
+            self._buffer_bytes += len(line)
+            due = self._buffer_bytes >= self._flush_threshold
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all buffered events to the log file."""
+        with self._lock:
+            _write_lines(self.log_path, self._buffer)
+            self._buffer_bytes = 0
+            self._pending.clear()
+
+    def _start_flusher(self) -> None:
+        """Start the delay flusher on first use; caller holds the lock."""
+        if self._flusher is not None:
+            return
+        self._flusher = threading.Thread(
+            target=_flush_after_delay,
+            args=(weakref.ref(self), self._pending, self._max_flush_delay),
+            name="security-audit-flush",
+            daemon=True,
+        )
+        self._flusher.start()
 
     def log_pii_detection(
         self,
@@ -114,6 +278,7 @@ class SecurityAuditLogger:
         since: datetime | None = None,
     ) -> list[SecurityEvent]:
         """Read events from log file with optional filtering."""
+        self.flush()
         if not self.log_path.exists():
             return []
 
@@ -122,37 +287,50 @@ class SecurityAuditLogger:
             normalized_since = normalized_since.replace(tzinfo=timezone.utc)
 
         events: list[SecurityEvent] = []
-        with open(self.log_path, "r", encoding="utf-8") as handle:
-            for line in handle:
-                if not line.strip():
-                    continue
-
-                event_dict = json.loads(line)
-                parsed_type = SecurityEventType(event_dict["event_type"])
-                event = SecurityEvent(
+        for line in _iter_lines(self.log_path):
+            if not line.strip():
+                continue
+
+            event_dict = _loads_line(line)
+            parsed_type = SecurityEventType(event_dict["event_type"])
+            # Filter on the raw record so rejected lines never build an event
+            if event_type is not None and parsed_type != event_type:
+                continue
+
+            timestamp = event_dict["timestamp"]
+            if normalized_since is not None and _parse_timestamp(timestamp) < normalized_since:
+                continue
+
+            events.append(
+                SecurityEvent(
                     event_type=parsed_type,
-                    timestamp=event_dict["timestamp"],
+                    timestamp=timestamp,
                     context=event_dict["context"],
                     severity=event_dict["severity"],
                     task_id=event_dict.get("task_id"),
                     user_id=event_dict.get("user_id"),
                 )
+            )
+
+        return events
 
-                if event_type is not None and event.event_type != event_type:
-                    continue
 
-                if normalized_since is not None:
-                    event_time = datetime.fromisoformat(event.timestamp)
-                    if event_time.tzinfo is None:
-                        event_time = event_time.replace(tzinfo=timezone.utc)
-                    if event_time < normalized_since:
-                        continue
+# Weak values: a logger no caller holds is flushed by its finalizer and its delay flusher exits
+_SHARED_LOGGERS: weakref.WeakValueDictionary[str, SecurityAuditLogger] = weakref.WeakValueDictionary()
+_SHARED_LOGGERS_LOCK = threading.Lock()
 
-                events.append(event)
 
-        return events
+def get_audit_logger(log_path: str | Path) -> SecurityAuditLogger:
+    """Return the process-wide audit logger for a path, creating it on first use."""
+    key = os.path.abspath(log_path)
+    with _SHARED_LOGGERS_LOCK:
+        logger = _SHARED_LOGGERS.get(key)
+        if logger is None:
+            logger = SecurityAuditLogger(key)
+            _SHARED_LOGGERS[key] = logger
+        return logger
 
 
 def create_default_audit_logger() -> SecurityAuditLogger:
-    """Create audit logger with default path."""
-    return SecurityAuditLogger("data/logs/security_audit.jsonl")
+    """Return the shared audit logger for the default path."""
+    return get_audit_logger("data/logs/security_audit.jsonl")
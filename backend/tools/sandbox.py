@@ -1,11 +1,37 @@
 from __future__ import annotations
 
+import codecs
+import errno
 import fnmatch
+import os
+import re
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
 from typing import Any
 
+# Same errors pathlib.Path.is_dir() treats as "not a directory" (e.g. symlink loops).
+_IGNORED_STAT_ERRNOS = frozenset({errno.ENOENT, errno.ENOTDIR, errno.EBADF, errno.ELOOP})
+
+
+def _entry_is_dir(entry: os.DirEntry[str]) -> bool:
+    try:
+        return entry.is_dir()
+    except OSError as exc:
+        if exc.errno in _IGNORED_STAT_ERRNOS:
+            return False
+        raise
+
+
+# Codecs that encode every ASCII character as exactly one byte.
+_ASCII_SINGLE_BYTE_CODECS = frozenset({"ascii", "utf-8", "iso8859-1", "cp1252"})
+
+
+def _encoded_size(content: str, encoding: str) -> int:
+    if content.isascii() and codecs.lookup(encoding).name in _ASCII_SINGLE_BYTE_CODECS:
+        return len(content)
+    return len(content.encode(encoding))
+
 
 @dataclass(frozen=True)
 class SandboxConfig:
@@ -178,7 +204,7 @@ class Sandbox:
         if not self.config.allow_write:
             return self._error(SandboxErrorCode.WRITE_NOT_ALLOWED, "Write operation is disabled")
 
-        content_size = len(content.encode(encoding))
+        content_size = _encoded_size(content, encoding)
         if content_size > self.config.max_write_bytes:
             return self._error(
                 SandboxErrorCode.WRITE_TOO_LARGE,
@@ -241,12 +267,15 @@ class Sandbox:
             matched: list[str] = []
             truncated = False
 
-            stack: list[Path] = [resolved_root]
+            pattern_match = re.compile(fnmatch.translate(os.path.normcase(pattern))).match
+
+            stack: list[tuple[str, str]] = [("", str(resolved_root))]
             while stack:
-                current = stack.pop()
-                children = sorted(current.iterdir(), key=lambda p: p.name)
+                current_rel, current = stack.pop()
+                with os.scandir(current) as it:
+                    children = sorted(it, key=lambda e: e.name)
                 for entry in children:
-                    rel = entry.relative_to(resolved_root).as_posix()
+                    rel = f"{current_rel}/{entry.name}" if current_rel else entry.name
 
                     visited += 1
                     if visited > max_visited:
@@ -256,16 +285,16 @@ class Sandbox:
                             max_visited=max_visited,
                         )
 
-                    if fnmatch.fnmatch(rel, pattern):
+                    if pattern_match(os.path.normcase(rel)):
                         if len(matched) < max_results:
                             matched.append(rel)
                         else:
                             truncated = True
 
-                    if entry.is_dir():
-                        stack.append(entry)
+                    if _entry_is_dir(entry):
+                        stack.append((rel, entry.path))
 
-                stack.sort(key=lambda p: p.as_posix(), reverse=True)
+                stack.sort(key=lambda item: item[0], reverse=True)
 
             return True, {
                 "code": "ok",
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from collections import defaultdict, deque
+import functools
+from collections import deque
 from dataclasses import dataclass
 from typing import Any
 
@@ -54,32 +55,8 @@ class DAGExecutor:
                 raise WorkflowGraphError(f"edge references unknown node: {edge.to_node}")
 
     def topological_order(self, graph: WorkflowGraph) -> list[str]:
-        node_set = set(graph.nodes)
-        adjacency: dict[str, list[str]] = defaultdict(list)
-        indegree = {node_id: 0 for node_id in graph.nodes}
-
-        for edge in graph.edges:
-            adjacency[edge.from_node].append(edge.to_node)
-            indegree[edge.to_node] += 1
-
-        for from_node in adjacency:
-            adjacency[from_node] = sorted(adjacency[from_node])
-
-        queue = deque(sorted(node_id for node_id in node_set if indegree[node_id] == 0))
-        ordered: list[str] = []
-
-        while queue:
-            node_id = queue.popleft()
-            ordered.append(node_id)
-            for downstream in adjacency.get(node_id, []):
-                indegree[downstream] -= 1
-                if indegree[downstream] == 0:
-                    queue.append(downstream)
-
-        if len(ordered) != len(graph.nodes):
-            raise WorkflowGraphError("workflow graph contains a cycle")
-
-        return ordered
+        # Fresh list per call; the cached order is shared across callers
+        return list(_topological_order(graph))
 
     def resolve_execution_order(
         self,
@@ -101,3 +78,37 @@ class DAGExecutor:
             context = node_registry[node_id].execute(context)
 
         return context
+
+
+# WorkflowGraph is frozen and hashable; plans compile to a handful of distinct graphs
+@functools.lru_cache(maxsize=64)
+def _topological_order(graph: WorkflowGraph) -> tuple[str, ...]:
+    # Indices follow sorted node ids, so ascending index order is the name order
+    node_ids = sorted(set(graph.nodes))
+    node_index = {node_id: index for index, node_id in enumerate(node_ids)}
+    successors: list[list[int]] = [[] for _ in node_ids]
+    indegree = [0] * len(node_ids)
+
+    for edge in graph.edges:
+        downstream = node_index[edge.to_node]
+        successors[node_index[edge.from_node]].append(downstream)
+        indegree[downstream] += 1
+
+    for targets in successors:
+        targets.sort()
+
+    queue = deque(index for index, count in enumerate(indegree) if count == 0)
+    ordered: list[str] = []
+
+    while queue:
+        index = queue.popleft()
+        ordered.append(node_ids[index])
+        for downstream in successors[index]:
+            indegree[downstream] -= 1
+            if indegree[downstream] == 0:
+                queue.append(downstream)
+
+    if len(ordered) != len(graph.nodes):
+        raise WorkflowGraphError("workflow graph contains a cycle")
+
+    return tuple(ordered)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import sys
 from typing import Any
 
 from backend.cache.key_policy import make_cache_key
@@ -10,6 +11,12 @@ from backend.retrieval.retrieval_types import RetrievalConfig
 
 from .base_node import BaseNode
 
+# Message keys and roles shared by every injected message; interned so role checks
+# against cached or stored messages can short-circuit on identity
+_KEY_ROLE = sys.intern("role")
+_KEY_CONTENT = sys.intern("content")
+_ROLE_SYSTEM = sys.intern("system")
+
 
 class ContextBuilderNode(BaseNode):
     def __init__(
@@ -150,17 +157,12 @@ class ContextBuilderNode(BaseNode):
             attachment_text = f"{attachment_text[:1200]}..."
 
         attachment_message = {
-            "role": "system",
-            "content": f"Attachment Context ({filename}):\n{attachment_text}",
+            _KEY_ROLE: _ROLE_SYSTEM,
+            _KEY_CONTENT: f"Attachment Context ({filename}):\n{attachment_text}",
         }
 
         output = list(messages)
-        insert_at = 0
-        for idx, message in enumerate(output):
-            if str(message.get("role", "")) == "system":
-                insert_at = idx + 1
-                break
-        output.insert(insert_at, attachment_message)
+        output.insert(_system_insert_index(output), attachment_message)
         return output
 
     def _inject_retrieved_context(
@@ -204,17 +206,19 @@ class ContextBuilderNode(BaseNode):
         if len(lines) == 1:
             return messages, []
 
-        retrieval_message = {"role": "system", "content": "\n".join(lines)}
+        retrieval_message = {_KEY_ROLE: _ROLE_SYSTEM, _KEY_CONTENT: "\n".join(lines)}
 
         output = list(messages)
-        insert_at = 0
-        for idx, message in enumerate(output):
-            if str(message.get("role", "")) == "system":
-                insert_at = idx + 1
-                break
+        output.insert(_system_insert_index(output), retrieval_message)
+        return output, [str(retrieval_message[_KEY_CONTENT])]
+
 
-        output.insert(insert_at, retrieval_message)
-        return output, [str(retrieval_message["content"])]
+def _system_insert_index(messages: list[dict[str, Any]]) -> int:
+    """Return the position just after the first system message, or 0."""
+    for idx, message in enumerate(messages):
+        if str(message.get(_KEY_ROLE, "")) == _ROLE_SYSTEM:
+            return idx + 1
+    return 0
 
 
 def _approx_token_count(text: str) -> int:
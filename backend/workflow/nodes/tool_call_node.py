@@ -4,7 +4,6 @@ from pathlib import Path
 from typing import Any, Callable, Literal, cast
 
 import backend.security.audit_logger as audit_logger_module
-from backend.security.audit_logger import SecurityAuditLogger
 from backend.security.privacy_wrapper import PrivacyExternalCallWrapper
 from backend.security.redactor import PIIRedactor
 from backend.search.budget import SearchBudgetConfig, SearchBudgetLedger
@@ -126,20 +125,24 @@ class ToolCallNode(BaseNode):
         if audit_log_path_raw is not None:
             audit_log_path = str(audit_log_path_raw).strip()
         if audit_log_path:
-            audit_logger = SecurityAuditLogger(audit_log_path)
+            audit_logger = audit_logger_module.get_audit_logger(audit_log_path)
         else:
             audit_logger = audit_logger_module.create_default_audit_logger()
         privacy_wrapper = PrivacyExternalCallWrapper(
             redactor=PIIRedactor(),
             audit_logger=audit_logger,
         )
-        ok, result = execute_tool_call(
-            request=request,
-            registry=registry,
-            sandbox=sandbox,
-            dispatch_map=dispatch_map,
-            privacy_wrapper=privacy_wrapper,
-        )
+        try:
+            ok, result = execute_tool_call(
+                request=request,
+                registry=registry,
+                sandbox=sandbox,
+                dispatch_map=dispatch_map,
+                privacy_wrapper=privacy_wrapper,
+            )
+        finally:
+            # Shared logger: the call's events go out in one write, visible once the node returns
+            audit_logger.flush()
 
         context["tool_ok"] = ok
         context["tool_result"] = result
@@ -1,52 +1,108 @@
 from __future__ import annotations
 
+import hashlib
+import http.client
+import importlib.util
 import json
 import os
 import sqlite3
-import subprocess
 import time
-import urllib.request
+from pathlib import Path
+from typing import NamedTuple
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
 
-def _run_command(command: list[str]) -> subprocess.CompletedProcess:
-    return subprocess.run(command, capture_output=True, text=True)
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+# Docker build helpers are shared with the validator so both harnesses fingerprint and build identically
+_VALIDATOR_PATH = Path(__file__).resolve().parents[2] / "scripts" / "validate_backend.py"
+
+
+def _load_validator():
+    spec = importlib.util.spec_from_file_location("validate_backend", _VALIDATOR_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+_validator = _load_validator()
+
+_BACKEND_HOST = "localhost"
+_BACKEND_PORT = 8000
+_TASK_PATH = "/task"
+_TASK_HEADERS = {"Content-Type": "application/json"}
+
+# Read-only connection to the episodic trace DB, shared by every query in one replay run
+_RO_CONN: sqlite3.Connection | None = None
+_RO_CONN_PATH: str | None = None
+
+
+class _DagEvent(NamedTuple):
+    event_type: object
+    node_id: object
+    node_type: object
+    controller_state: object
+    success: object
+    error: object
+    error_code: object
+    elapsed_ns: object
 
 
 def _bootstrap_backend() -> tuple[bool, str | None]:
     steps: list[list[str]] = [
         ["docker", "compose", "config"],
         ["docker", "compose", "build", "backend"],
-        ["docker", "compose", "up", "-d", "redis", "backend"],
+        # --wait blocks until the compose healthcheck on /health passes
+        ["docker", "compose", "up", "-d", "--wait", "--wait-timeout", "60", "redis", "backend"],
     ]
 
+    build_fp = _validator.docker_build_fingerprint()
+    step_env = {**_validator.DOCKER_BUILD_ENV, "JARVIS_BUILD_FP": build_fp}
+    # Opt-in: skip config/build when the image was stamped from identical inputs
+    if os.environ.get("JARVIS_SKIP_UNCHANGED_BUILD") == "1" and _validator.image_fingerprint() == build_fp:
+        steps = steps[2:]
+
     for command in steps:
-        proc = _run_command(command)
-        if proc.returncode != 0:
-            excerpt = ((proc.stderr or "") + (proc.stdout or "")).strip()
-            return False, f"{' '.join(command)} :: {' '.join(excerpt.splitlines()[:10])}"
+        returncode, stderr_tail = _validator.run_docker_step(command, step_env)
+        if returncode != 0:
+            tail_lines = [line.strip() for line in stderr_tail.splitlines() if line.strip()]
+            return False, f"{' '.join(command)} :: {' '.join(tail_lines[-10:])}"
 
-    last_error: str | None = None
-    for _ in range(20):
-        try:
-            with urllib.request.urlopen("http://localhost:8000/health", timeout=15) as response:
-                _ = response.read().decode("utf-8", errors="replace")
-            last_error = None
-            break
-        except Exception as exc:
-            last_error = str(exc)
-            time.sleep(1)
+    return True, None
 
-    if last_error is not None:
-        return False, f"health check failed: {last_error}"
 
-    return True, None
+def _ro_connection(db_path: str) -> sqlite3.Connection | None:
+    global _RO_CONN, _RO_CONN_PATH
+    if _RO_CONN is not None and _RO_CONN_PATH == db_path:
+        return _RO_CONN
+    _close_ro_connection()
+    uri = f"{Path(db_path).resolve().as_uri()}?mode=ro"
+    try:
+        _RO_CONN = sqlite3.connect(uri, uri=True, check_same_thread=False)
+    except sqlite3.OperationalError:
+        # The backend creates the DB on first write; until then there is nothing to read
+        return None
+    _RO_CONN_PATH = db_path
+    return _RO_CONN
+
+
+def _close_ro_connection() -> None:
+    global _RO_CONN, _RO_CONN_PATH
+    if _RO_CONN is not None:
+        _RO_CONN.close()
+    _RO_CONN = None
+    _RO_CONN_PATH = None
 
 
 def _decisions_high_water_mark(db_path: str) -> int:
-    if not os.path.exists(db_path):
+    conn = _ro_connection(db_path)
+    if conn is None:
         return 0
-    with sqlite3.connect(db_path) as conn:
-        row = conn.execute("SELECT COALESCE(MAX(id), 0) FROM decisions").fetchone()
+    row = conn.execute("SELECT COALESCE(MAX(id), 0) FROM decisions").fetchone()
     return int(row[0]) if row else 0
 
 
@@ -76,28 +132,48 @@ def _canonicalize_workflow_graph(workflow_graph: dict[str, object]) -> dict[str,
     }
 
 
-def _fetch_canonical_dag_events(db_path: str, task_id: str, min_decision_id: int) -> list[dict[str, object]]:
-    if not os.path.exists(db_path):
-        return []
+def _content_digest(value: object) -> str:
+    if orjson is not None:
+        encoded = orjson.dumps(value, option=orjson.OPT_SORT_KEYS)
+    else:
+        encoded = json.dumps(value, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
 
-    with sqlite3.connect(db_path) as conn:
-        rows = conn.execute(
-            """
-            SELECT content
-            FROM decisions
-            WHERE id > ?
-              AND task_id = ?
-              AND action_type = 'dag_node_event'
-            ORDER BY id ASC
-            """,
-            (int(min_decision_id), str(task_id)),
-        ).fetchall()
+def _fetch_dag_events(db_path: str, task_id: str, min_decision_id: int) -> list[_DagEvent]:
+    conn = _ro_connection(db_path)
+    if conn is None:
+        return []
 
+    # JSON1 extracts just the compared fields, so no event payload is decoded in Python
+    rows = conn.execute(
+        """
+        SELECT
+            json_extract(content, '$.event_type'),
+            json_extract(content, '$.node_id'),
+            json_extract(content, '$.node_type'),
+            json_extract(content, '$.controller_state'),
+            json_extract(content, '$.success'),
+            json_extract(content, '$.error'),
+            json_extract(content, '$.error_code'),
+            json_extract(content, '$.elapsed_ns')
+        FROM decisions
+        WHERE task_id = ?
+          AND action_type = 'dag_node_event'
+          AND id > ?
+        ORDER BY id ASC
+        """,
+        (str(task_id), int(min_decision_id)),
+    ).fetchall()
+
+    return [_DagEvent._make(row) for row in rows]
+
+
+def _canonical_dag_events(events: list[_DagEvent]) -> list[dict[str, object]]:
     canonical: list[dict[str, object]] = []
-    for (content,) in rows:
-        payload = json.loads(content)
-        error_raw = payload.get("error")
-        error_code_raw = payload.get("error_code")
+    for event in events:
+        error_raw = event.error
+        error_code_raw = event.error_code
         error_present = False
         if isinstance(error_raw, str):
             error_present = bool(error_raw.strip())
@@ -106,11 +182,11 @@ def _fetch_canonical_dag_events(db_path: str, task_id: str, min_decision_id: int
 
         canonical.append(
             {
-                "event_type": str(payload.get("event_type", "")),
-                "node_id": str(payload.get("node_id", "")),
-                "node_type": str(payload.get("node_type", "")),
-                "controller_state": str(payload.get("controller_state", "")),
-                "success": bool(payload.get("success", False)),
+                "event_type": str(event.event_type or ""),
+                "node_id": str(event.node_id or ""),
+                "node_type": str(event.node_type or ""),
+                "controller_state": str(event.controller_state or ""),
+                "success": bool(event.success),
                 "error_present": error_present,
                 "error_code": str(error_code_raw).strip() if error_code_raw is not None else "",
             }
@@ -118,49 +194,25 @@ def _fetch_canonical_dag_events(db_path: str, task_id: str, min_decision_id: int
     return canonical
 
 
-def _fetch_controller_latency_baseline(
-    db_path: str,
-    task_id: str,
-    min_decision_id: int,
-) -> dict[str, object]:
-    if not os.path.exists(db_path):
-        return {"total_elapsed_ns": 0, "node_elapsed_ns": {}}
-
-    with sqlite3.connect(db_path) as conn:
-        rows = conn.execute(
-            """
-            SELECT content
-            FROM decisions
-            WHERE id > ?
-              AND task_id = ?
-              AND action_type = 'dag_node_event'
-            ORDER BY id ASC
-            """,
-            (int(min_decision_id), str(task_id)),
-        ).fetchall()
-
+def _controller_latency_baseline(events: list[_DagEvent]) -> dict[str, object]:
     total_elapsed_ns = 0
     node_elapsed_ns: dict[str, int] = {}
-    for (content,) in rows:
-        payload = json.loads(content)
-        if str(payload.get("event_type", "")) != "node_end":
+    for event_type, node_id, _, controller_state, _, _, _, elapsed_ns_value in events:
+        if event_type != "node_end":
             continue
-
-        elapsed_ns_value = payload.get("elapsed_ns")
         if not isinstance(elapsed_ns_value, int):
             continue
 
         elapsed_ns = max(0, int(elapsed_ns_value))
         total_elapsed_ns += elapsed_ns
 
-        controller_state = str(payload.get("controller_state", ""))
-        node_id = str(payload.get("node_id", ""))
-        key = f"{controller_state}:{node_id}"
+        key = f"{controller_state or ''}:{node_id or ''}"
         node_elapsed_ns[key] = int(node_elapsed_ns.get(key, 0) + elapsed_ns)
 
     return {
         "total_elapsed_ns": int(total_elapsed_ns),
-        "node_elapsed_ns": dict(sorted(node_elapsed_ns.items())),
+        # Ordered pairs are only reported or compared, never looked up by key
+        "node_elapsed_ns_sorted": tuple(sorted(node_elapsed_ns.items())),
     }
 
 
@@ -173,39 +225,49 @@ def _int_from_mapping(mapping: object, key: str) -> int:
 
 def _load_archived_task_graph(task_id: str) -> dict[str, object] | None:
     archive_path = os.path.join("data", "archives", f"{task_id}.json")
-    if not os.path.exists(archive_path):
+    try:
+        with open(archive_path, "rb") as handle:
+            task_state = _json_loads(handle.read())
+    except FileNotFoundError:
         return None
 
-    with open(archive_path, "r", encoding="utf-8") as handle:
-        task_state = json.load(handle)
-
     workflow_graph = task_state.get("workflow_graph")
     return workflow_graph if isinstance(workflow_graph, dict) else None
 
 
 def _run_single_task(user_input: str) -> dict[str, str]:
-    task_url = "http://localhost:8000/task"
-    request_body = json.dumps({"user_input": user_input}).encode("utf-8")
-    request = urllib.request.Request(
-        task_url,
-        data=request_body,
-        headers={"Content-Type": "application/json"},
-        method="POST",
-    )
+    task_body = {"user_input": user_input}
+    request_body = orjson.dumps(task_body) if orjson is not None else json.dumps(task_body).encode("utf-8")
+    # Retries share one keep-alive connection; a failed attempt closes it and the next reconnects
+    conn = http.client.HTTPConnection(_BACKEND_HOST, _BACKEND_PORT, timeout=60)
     last_error: str | None = None
-    for _ in range(5):
-        try:
-            with urllib.request.urlopen(request, timeout=60) as response:
-                payload = response.read().decode("utf-8", errors="replace")
-            return json.loads(payload)
-        except Exception as exc:
-            last_error = str(exc)
-            time.sleep(1)
+    try:
+        for _ in range(5):
+            try:
+                conn.request("POST", _TASK_PATH, body=request_body, headers=_TASK_HEADERS)
+                response = conn.getresponse()
+                payload = response.read()
+                if not 200 <= response.status < 300:
+                    raise RuntimeError(f"HTTP {response.status} {response.reason}")
+                return _json_loads(payload)
+            except Exception as exc:
+                last_error = str(exc)
+                conn.close()
+                time.sleep(1)
+    finally:
+        conn.close()
 
     raise RuntimeError(f"task request failed after retries: {last_error}")
 
 
 def run_replay_baseline_once() -> dict[str, object]:
+    try:
+        return _run_replay_baseline()
+    finally:
+        _close_ro_connection()
+
+
+def _run_replay_baseline() -> dict[str, object]:
     ok, error = _bootstrap_backend()
     if not ok:
         return {"passed": False, "reason": str(error)}
@@ -228,13 +290,15 @@ def run_replay_baseline_once() -> dict[str, object]:
         if workflow_graph is None:
             return {"passed": False, "reason": f"missing archived workflow_graph for {task_id}"}
 
-        canonical_events = _fetch_canonical_dag_events(db_path, task_id, high_water)
+        # One query feeds both the event and latency views
+        dag_events = _fetch_dag_events(db_path, task_id, high_water)
+        canonical_events = _canonical_dag_events(dag_events)
         if not canonical_events:
             return {"passed": False, "reason": f"missing dag_node_event rows for {task_id}"}
 
         canonical_workflow_graph = _canonicalize_workflow_graph(workflow_graph)
 
-        latency_baseline = _fetch_controller_latency_baseline(db_path, task_id, high_water)
+        latency_baseline = _controller_latency_baseline(dag_events)
         if _int_from_mapping(latency_baseline, "total_elapsed_ns") <= 0:
             return {"passed": False, "reason": f"missing controller latency baseline for {task_id}"}
 
@@ -242,14 +306,17 @@ def run_replay_baseline_once() -> dict[str, object]:
             {
                 "task_id": task_id,
                 "canonical_workflow_graph": canonical_workflow_graph,
+                "canonical_workflow_graph_digest": _content_digest(canonical_workflow_graph),
                 "canonical_events": canonical_events,
+                "canonical_events_digest": _content_digest(canonical_events),
                 "latency_baseline": latency_baseline,
             }
         )
 
     run1, run2 = runs
-    graph_equal = run1["canonical_workflow_graph"] == run2["canonical_workflow_graph"]
-    events_equal = run1["canonical_events"] == run2["canonical_events"]
+    # Canonical forms are compared by content digest; full forms are only reported on mismatch
+    graph_equal = run1["canonical_workflow_graph_digest"] == run2["canonical_workflow_graph_digest"]
+    events_equal = run1["canonical_events_digest"] == run2["canonical_events_digest"]
 
     run1_total_elapsed_ns = _int_from_mapping(run1.get("latency_baseline"), "total_elapsed_ns")
     run2_total_elapsed_ns = _int_from_mapping(run2.get("latency_baseline"), "total_elapsed_ns")
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import zlib
+from collections.abc import Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pytest
+
+if TYPE_CHECKING:
+    from fastapi.testclient import TestClient
+
+    from backend.memory.memory_manager import MemoryManager
+
+
+class _TestEmbeddingFunction:
+    def encode(self, text: str) -> np.ndarray:
+        # Any stable bucket in [1, 13] will do; adler32 is C-level and, unlike hash(), seed-independent
+        bucket = zlib.adler32(text.encode("utf-8")) % 13 + 1
+        return np.full(384, float(bucket), dtype=np.float32)
+
+
+@pytest.fixture(scope="session")
+def client() -> Iterator[TestClient]:
+    # Imported on first use so collecting or running unrelated tests never loads the API graph
+    from fastapi.testclient import TestClient
+
+    from backend.api.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def embedding_fn() -> _TestEmbeddingFunction:
+    # Deterministic and stateless, so one instance serves every test
+    return _TestEmbeddingFunction()
+
+
+@pytest.fixture
+def memory(tmp_path: Path, embedding_fn: _TestEmbeddingFunction) -> MemoryManager:
+    from backend.memory.memory_manager import MemoryManager
+
+    return MemoryManager(
+        episodic_db_path=str(tmp_path / "episodic.db"),
+        working_base_path=str(tmp_path / "working"),
+        working_archive_path=str(tmp_path / "archives"),
+        semantic_db_path=str(tmp_path / "semantic.db"),
+        embedding_model=embedding_fn,
+    )
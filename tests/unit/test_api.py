@@ -1,12 +1,7 @@
 from fastapi.testclient import TestClient
 
-from backend.api.main import app
 
-
-client = TestClient(app)
-
-
-def test_health_endpoint_returns_ok() -> None:
+def test_health_endpoint_returns_ok(client: TestClient) -> None:
     response = client.get("/health")
     assert response.status_code == 200
     body = response.json()
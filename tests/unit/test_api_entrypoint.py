@@ -1,14 +1,35 @@
 from fastapi.testclient import TestClient
+import pytest
 import sys
 import types
 
-from backend.api.main import app
 
+class _StubLlama:
+    def __init__(self, *args, **kwargs) -> None:
+        pass
 
-client = TestClient(app)
+    def create_completion(
+        self,
+        prompt: str,
+        max_tokens: int = 100,
+        echo: bool = False,
+        stop: list[str] | None = None,
+    ) -> dict:
+        # The question sits inside the rendered conversation, so match anywhere in the prompt
+        if "What is my name? Reply with only the name." in prompt:
+            return {"choices": [{"text": "Alice"}]}
+        return {"choices": [{"text": "Acknowledged."}]}
 
 
-def test_post_task_returns_required_keys(monkeypatch, tmp_path) -> None:
+_STUB_LLAMA_MODULE = types.SimpleNamespace(Llama=_StubLlama)
+
+
+@pytest.fixture
+def stub_llama(monkeypatch):
+    monkeypatch.setitem(sys.modules, "llama_cpp", _STUB_LLAMA_MODULE)
+
+
+def test_post_task_returns_required_keys(client: TestClient, monkeypatch, tmp_path) -> None:
     monkeypatch.setenv("DATA_PATH", str(tmp_path))
     response = client.post("/task", json={"user_input": "hello"})
 
@@ -19,33 +40,18 @@ def test_post_task_returns_required_keys(monkeypatch, tmp_path) -> None:
     assert "llm_output" in body
 
 
-def test_get_task_non_existent_returns_404(monkeypatch, tmp_path) -> None:
+def test_get_task_non_existent_returns_404(client: TestClient, monkeypatch, tmp_path) -> None:
     monkeypatch.setenv("DATA_PATH", str(tmp_path))
     response = client.get("/task/does-not-exist")
 
     assert response.status_code == 404
 
 
-def test_post_task_with_task_id_continues_existing_task(monkeypatch, tmp_path) -> None:
+def test_post_task_with_task_id_continues_existing_task(
+    client: TestClient, monkeypatch, tmp_path, stub_llama
+) -> None:
     monkeypatch.setenv("DATA_PATH", str(tmp_path))
 
-    class _StubLlama:
-        def __init__(self, *args, **kwargs) -> None:
-            pass
-
-        def create_completion(
-            self,
-            prompt: str,
-            max_tokens: int = 100,
-            echo: bool = False,
-            stop: list[str] | None = None,
-        ) -> dict:
-            if "What is my name? Reply with only the name." in prompt:
-                return {"choices": [{"text": "Alice"}]}
-            return {"choices": [{"text": "Acknowledged."}]}
-
-    monkeypatch.setitem(sys.modules, "llama_cpp", types.SimpleNamespace(Llama=_StubLlama))
-
     first = client.post("/task", json={"user_input": "My name is Alice. Remember it."})
     assert first.status_code == 200
     first_body = first.json()
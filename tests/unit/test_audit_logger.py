@@ -1,11 +1,18 @@
+import gc
 import json
+import math
+import time
 from datetime import datetime, timezone
 from pathlib import Path
 
+import orjson
+
 from backend.security.audit_logger import (
+    _SHARED_LOGGERS,
     SecurityAuditLogger,
     SecurityEvent,
     SecurityEventType,
+    get_audit_logger,
 )
 
 
@@ -33,11 +40,14 @@ def test_jsonl_append_and_read_back(tmp_path: Path) -> None:
 
     logger.log_event(event_one)
     logger.log_event(event_two)
+    logger.flush()
 
-    lines = logger.log_path.read_text(encoding="utf-8").splitlines()
-    assert len(lines) == 2
-    assert json.loads(lines[0])["event_type"] == "pii_detected"
-    assert json.loads(lines[1])["event_type"] == "permission_denied"
+    data = logger.log_path.read_bytes()
+    assert data.endswith(b"\n")
+    records = [orjson.loads(line) for line in data.split(b"\n") if line]
+    assert len(records) == 2
+    assert records[0]["event_type"] == "pii_detected"
+    assert records[1]["event_type"] == "permission_denied"
 
     events = logger.read_events()
     assert len(events) == 2
@@ -158,3 +168,171 @@ def test_convenience_helpers_emit_expected_fields_and_parseable_timestamps(tmp_p
     for event in events:
         parsed = datetime.fromisoformat(event.timestamp)
         assert parsed.tzinfo is not None
+
+
+def test_log_event_buffers_until_flush(tmp_path: Path) -> None:
+    logger = SecurityAuditLogger(tmp_path / "buffered.jsonl", max_flush_delay=60.0)
+
+    logger.log_event(
+        SecurityEvent(
+            event_type=SecurityEventType.PII_DETECTED,
+            timestamp="2026-02-24T12:00:00+00:00",
+            context={},
+            severity="warning",
+        )
+    )
+    assert not logger.log_path.exists()
+
+    logger.flush()
+    assert len(logger.log_path.read_text(encoding="utf-8").splitlines()) == 1
+
+
+def test_log_event_flushes_when_threshold_reached(tmp_path: Path) -> None:
+    logger = SecurityAuditLogger(tmp_path / "threshold.jsonl", flush_threshold=1, max_flush_delay=60.0)
+
+    logger.log_event(
+        SecurityEvent(
+            event_type=SecurityEventType.PII_DETECTED,
+            timestamp="2026-02-24T12:00:00+00:00",
+            context={},
+            severity="warning",
+        )
+    )
+
+    assert len(logger.log_path.read_text(encoding="utf-8").splitlines()) == 1
+
+
+def test_pending_events_written_when_logger_is_dropped(tmp_path: Path) -> None:
+    log_path = tmp_path / "dropped.jsonl"
+    logger = SecurityAuditLogger(log_path, max_flush_delay=60.0)
+    logger.log_event(
+        SecurityEvent(
+            event_type=SecurityEventType.PII_DETECTED,
+            timestamp="2026-02-24T12:00:00+00:00",
+            context={},
+            severity="warning",
+        )
+    )
+
+    del logger
+    gc.collect()
+
+    assert len(log_path.read_text(encoding="utf-8").splitlines()) == 1
+
+
+def test_pending_events_flushed_after_max_delay(tmp_path: Path) -> None:
+    logger = SecurityAuditLogger(tmp_path / "delayed.jsonl", max_flush_delay=0.05)
+    logger.log_event(
+        SecurityEvent(
+            event_type=SecurityEventType.PII_DETECTED,
+            timestamp="2026-02-24T12:00:00+00:00",
+            context={},
+            severity="warning",
+        )
+    )
+
+    deadline = time.monotonic() + 5.0
+    while not logger.log_path.exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert len(logger.log_path.read_text(encoding="utf-8").splitlines()) == 1
+
+
+def test_get_audit_logger_shares_one_logger_per_path(tmp_path: Path) -> None:
+    first = get_audit_logger(tmp_path / "shared.jsonl")
+    second = get_audit_logger(str(tmp_path / "shared.jsonl"))
+
+    assert first is second
+    assert get_audit_logger(tmp_path / "other.jsonl") is not first
+
+
+def test_filter_by_since_accepts_zulu_suffix(tmp_path: Path) -> None:
+    logger = _make_logger(tmp_path, "filter_since_zulu.jsonl")
+
+    for index, timestamp in enumerate(["2026-02-24T12:00:00Z", "2026-02-24T12:10:00.250000Z"]):
+        logger.log_event(
+            SecurityEvent(
+                event_type=SecurityEventType.PII_DETECTED,
+                timestamp=timestamp,
+                context={"index": index},
+                severity="warning",
+            )
+        )
+
+    filtered = logger.read_events(since=datetime(2026, 2, 24, 12, 5, 0, tzinfo=timezone.utc))
+    assert [event.context["index"] for event in filtered] == [1]
+
+
+def test_read_events_handles_empty_file_blank_lines_and_missing_trailing_newline(tmp_path: Path) -> None:
+    logger = _make_logger(tmp_path, "raw.jsonl")
+    logger.log_path.write_bytes(b"")
+    assert logger.read_events() == []
+
+    record = {
+        "event_type": "pii_detected",
+        "timestamp": "2026-02-24T12:00:00+00:00",
+        "context": {},
+        "severity": "warning",
+    }
+    line = json.dumps(record).encode("ascii")
+    logger.log_path.write_bytes(line + b"\n\n\r\n" + line)
+
+    assert len(logger.read_events()) == 2
+
+
+def test_jsonl_line_round_trips_non_ascii_context(tmp_path: Path) -> None:
+    logger = _make_logger(tmp_path, "non_ascii.jsonl")
+    logger.log_event(
+        SecurityEvent(
+            event_type=SecurityEventType.SUSPICIOUS_PATTERN,
+            timestamp="2026-02-24T12:00:00+00:00",
+            context={"snippet": "café ☃", "nested": {"count": 2, "flag": None}},
+            severity="critical",
+            user_id="user-1",
+        )
+    )
+    logger.flush()
+
+    data = logger.log_path.read_bytes()
+    assert data.isascii()
+    record = json.loads(data)
+    assert list(record) == ["event_type", "timestamp", "context", "severity", "task_id", "user_id"]
+    assert record["event_type"] == "suspicious_pattern"
+
+    [event] = logger.read_events()
+    assert event.context == {"snippet": "café ☃", "nested": {"count": 2, "flag": None}}
+    assert event.task_id is None
+    assert event.user_id == "user-1"
+
+
+def test_log_external_call_falls_back_to_stdlib_for_non_plain_payloads(tmp_path: Path) -> None:
+    logger = _make_logger(tmp_path, "non_plain.jsonl")
+    logger.log_external_call("provider", "/endpoint", {1: "int-key"})
+    logger.log_external_call("provider", "/endpoint", {"n": 2**70})
+    logger.log_external_call("provider", "/endpoint", {"f": float("nan")})
+    logger.flush()
+
+    lines = logger.log_path.read_bytes().splitlines()
+    assert all(line.isascii() for line in lines)
+    assert b'"payload":{"f":NaN}' in lines[2]
+
+    payloads = [event.context["payload"] for event in logger.read_events()]
+    assert payloads[0] == {"1": "int-key"}
+    assert payloads[1] == {"n": 2**70}
+    assert math.isnan(payloads[2]["f"])
+
+
+def test_get_audit_logger_releases_dropped_loggers_and_their_flushers(tmp_path: Path) -> None:
+    flushers = []
+    for index in range(5):
+        logger = get_audit_logger(tmp_path / f"released-{index}.jsonl")
+        logger.log_permission_denied("write", "denied")
+        logger.flush()
+        flushers.append(logger._flusher)
+    del logger
+    gc.collect()
+
+    assert not any(str(tmp_path) in key for key in _SHARED_LOGGERS)
+    for flusher in flushers:
+        flusher.join(timeout=5.0)
+    assert not any(flusher.is_alive() for flusher in flushers)
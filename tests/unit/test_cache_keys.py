@@ -1,11 +1,13 @@
 """Unit tests for deterministic cache key policy and stable JSON helpers."""
 from __future__ import annotations
 
+import json
 import math
+from datetime import datetime, timezone
 
 import pytest
 
-from backend.cache.key_policy import dumps_json, loads_json, make_cache_key
+from backend.cache.key_policy import dumps_json, equals_json, loads_json, make_cache_key
 
 
 def test_same_logical_input_produces_identical_key() -> None:
@@ -40,6 +42,9 @@ def test_dumps_json_stability_for_nested_objects() -> None:
     s2 = dumps_json(obj2)
     assert s1 == s2
     assert loads_json(s1) == loads_json(s2) == {"a": {"a": 1, "b": 2}, "z": [3, 2, 1]}
+    assert equals_json(s1, s2)
+    assert equals_json(s1, s2.encode("ascii"))
+    assert not equals_json(s1, dumps_json({"a": {"a": 1, "b": 3}, "z": [3, 2, 1]}))
 
 
 def test_ascii_only_output_for_non_ascii_input() -> None:
@@ -55,3 +60,24 @@ def test_non_finite_float_values_rejected() -> None:
         make_cache_key("x", parts={"v": math.inf})
     with pytest.raises(ValueError):
         make_cache_key("x", parts={"v": -math.inf})
+
+
+def test_dumps_json_escapes_control_and_delete_characters_like_stdlib() -> None:
+    assert dumps_json({"k": "a\x00\x1f\x7f\n"}) == '{"k":"a\\u0000\\u001f\\u007f\\n"}'
+
+
+def test_loads_json_accepts_stdlib_only_literals() -> None:
+    assert loads_json(str(2**70)) == 2**70
+    assert math.isnan(loads_json('{"v":NaN}')["v"])
+
+
+def test_dumps_json_float_and_non_finite_output_matches_stdlib() -> None:
+    obj = {"small": 1e-05, "big": 1e20, "nan": math.nan, "inf": -math.inf}
+    expected = json.dumps(obj, sort_keys=True, ensure_ascii=True, separators=(",", ":"))
+    assert dumps_json(obj) == expected
+    assert '"small":1e-05' in expected and '"nan":NaN' in expected
+
+
+def test_dumps_json_rejects_types_stdlib_cannot_serialize() -> None:
+    with pytest.raises(TypeError):
+        dumps_json({"at": datetime(2026, 1, 1, tzinfo=timezone.utc)})
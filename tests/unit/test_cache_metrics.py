@@ -85,6 +85,7 @@ def test_reset_clears_all_state_deterministically() -> None:
     assert metrics.category_misses == {}
     assert metrics.summary()["hit_rate"] == 0.0
     assert metrics.summary()["hit_rate_pct"] == "0.00%"
+    assert metrics.summary()["categories"] == {}
 
 
 def test_get_metrics_returns_global_singleton() -> None:
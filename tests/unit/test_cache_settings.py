@@ -55,3 +55,21 @@ def test_load_cache_settings_ttl_invalid_values_fallback(monkeypatch) -> None:
     assert settings.cache_default_ttl == 3600
     assert settings.context_cache_ttl_seconds == 3600
     assert settings.tool_cache_ttl_seconds == 1800
+
+
+def test_load_cache_settings_reflects_env_and_dotenv_changes(monkeypatch, tmp_path) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("CACHE_ENABLED", raising=False)
+    monkeypatch.setenv("REDIS_URL", "redis://env:6379/4")
+
+    assert load_cache_settings().cache_enabled is False
+    assert load_cache_settings().redis_url == "redis://env:6379/4"
+
+    monkeypatch.setenv("CACHE_ENABLED", "true")
+    assert load_cache_settings().cache_enabled is True
+
+    # .env takes precedence over the OS environment and is re-read once it changes
+    (tmp_path / ".env").write_text("CACHE_ENABLED=false\nREDIS_URL=redis://dotenv:6379/5\n", encoding="utf-8")
+    settings = load_cache_settings()
+    assert settings.cache_enabled is False
+    assert settings.redis_url == "redis://dotenv:6379/5"
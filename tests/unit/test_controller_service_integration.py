@@ -1,14 +1,18 @@
-import json
-import sqlite3
 import sys
-import tempfile
 import types
+from collections.abc import Iterator
+from contextlib import closing
 from pathlib import Path
+from uuid import uuid4
+
+import orjson
+import pytest
 
 import backend.security.audit_logger as audit_logger_module
 import backend.controller.controller_service as controller_service_module
 from backend.controller.controller_service import ControllerService
 from backend.security.audit_logger import SecurityAuditLogger
+from backend.workflow import BaseNode
 from backend.workflow.dag_executor import DAGExecutor
 from backend.memory.memory_manager import MemoryManager
 from backend.models.escalation_policy import EscalationProviderBase
@@ -16,10 +20,17 @@ from backend.models.hardware_profiler import HardwareService, HardwareType
 from backend.models.model_registry import ModelRegistry
 
 
+# Only 13 distinct embeddings exist, so build each once and share it
+_VECTORS = tuple(tuple([float(base)] * 384) for base in range(1, 14))
+
+
 class TestEmbeddingFunction:
-    def encode(self, text: str) -> list[float]:
-        base = float((sum(ord(ch) for ch in text) % 13) + 1)
-        return [base] * 384
+    def encode(self, text: str) -> tuple[float, ...]:
+        return _VECTORS[sum(text.encode("utf-8")) % 13]
+
+
+# Stateless, so every MemoryManager built here shares the one instance
+_TEST_EMBED = TestEmbeddingFunction()
 
 
 class RecordingMemoryManager(MemoryManager):
@@ -30,6 +41,7 @@ class RecordingMemoryManager(MemoryManager):
         working_archive_path: str,
         semantic_db_path: str,
         embedding_model: TestEmbeddingFunction,
+        sqlite_pragmas: dict[str, str] | None = None,
     ) -> None:
         super().__init__(
             episodic_db_path=episodic_db_path,
@@ -37,6 +49,7 @@ class RecordingMemoryManager(MemoryManager):
             working_archive_path=working_archive_path,
             semantic_db_path=semantic_db_path,
             embedding_model=embedding_model,
+            sqlite_pragmas=sqlite_pragmas,
         )
         self.semantic_writes: list[dict] = []
 
@@ -45,29 +58,86 @@ class RecordingMemoryManager(MemoryManager):
         return super().store_knowledge(text, metadata)
 
 
-def build_memory(tmp_dir: str) -> MemoryManager:
-    base = Path(tmp_dir)
+# Throwaway databases: trade crash durability for page-cache commits
+TEST_SQLITE_PRAGMAS = {"journal_mode": "WAL", "synchronous": "NORMAL", "temp_store": "MEMORY"}
+
+
+def _episodic_db_path(base: Path, in_memory: bool) -> str:
+    if in_memory:
+        # Shared-cache URI: the store's long-lived connection keeps this RAM database alive, and
+        # extra connections from EpisodicMemory.connect() (fetch_decisions, fetch_node_events) see the same data
+        return f"file:episodic-{uuid4().hex}?mode=memory&cache=shared"
+    return str(base / "episodic.db")
+
+
+def build_memory(base: Path, in_memory: bool = True) -> MemoryManager:
     return MemoryManager(
-        episodic_db_path=str(base / "episodic.db"),
+        episodic_db_path=_episodic_db_path(base, in_memory),
         working_base_path=str(base / "working"),
         working_archive_path=str(base / "archives"),
         semantic_db_path=str(base / "semantic.db"),
-        embedding_model=TestEmbeddingFunction(),
+        embedding_model=_TEST_EMBED,
+        sqlite_pragmas=TEST_SQLITE_PRAGMAS,
     )
 
 
-def build_recording_memory(tmp_dir: str) -> RecordingMemoryManager:
-    base = Path(tmp_dir)
+def build_recording_memory(base: Path, in_memory: bool = True) -> RecordingMemoryManager:
     return RecordingMemoryManager(
-        episodic_db_path=str(base / "episodic.db"),
+        episodic_db_path=_episodic_db_path(base, in_memory),
         working_base_path=str(base / "working"),
         working_archive_path=str(base / "archives"),
         semantic_db_path=str(base / "semantic.db"),
-        embedding_model=TestEmbeddingFunction(),
+        embedding_model=_TEST_EMBED,
+        sqlite_pragmas=TEST_SQLITE_PRAGMAS,
     )
 
 
+_DECISIONS_SQL = """
+    SELECT status, content
+    FROM decisions
+    WHERE task_id = ? AND action_type = ?
+    ORDER BY id ASC
+"""
+
+
+def fetch_decisions(memory: MemoryManager, task_id: str, action_type: str) -> list[tuple[str, str]]:
+    with closing(memory.episodic.connect()) as conn:
+        return conn.execute(_DECISIONS_SQL, (task_id, action_type)).fetchall()
+
+
+# json_extract keeps the dag_node_event payload parsing inside SQLite
+_NODE_EVENTS_SQL = """
+    SELECT json_extract(content, '$.node_id'), json_extract(content, ?)
+    FROM decisions
+    WHERE task_id = ? AND action_type = 'dag_node_event'
+    ORDER BY id ASC
+"""
+
+
+def fetch_node_events(memory: MemoryManager, task_id: str, field: str = "event_type") -> list[tuple[str, str]]:
+    with closing(memory.episodic.connect()) as conn:
+        return conn.execute(_NODE_EVENTS_SQL, (f"$.{field}", task_id)).fetchall()
+
+
+def audit_log_contains(log_path: Path, *event_types: str) -> bool:
+    """Stream the audit JSONL and stop as soon as every event type has been seen."""
+    missing = set(event_types)
+    with open(log_path, "rb") as handle:
+        for line in handle:
+            missing.discard(orjson.loads(line)["event_type"])
+            if not missing:
+                return True
+    return False
+
+
 class StubHardwareService(HardwareService):
+    def __init__(self) -> None:
+        # Answers are fixed, so skip the psutil/GPU probe HardwareService runs on construction
+        self._cpu_info = {}
+        self._gpu_info = []
+        self._memory_info = {}
+        self._accel_providers = []
+
     def detect_hardware_type(self) -> HardwareType:
         return HardwareType.CPU_ONLY
 
@@ -83,6 +153,47 @@ class StubModelRegistry(ModelRegistry):
         return None
 
 
+class NoopNode(BaseNode):
+    def execute(self, context: dict) -> dict:
+        return context
+
+
+@pytest.fixture(scope="module")
+def tool_service(tmp_path_factory: pytest.TempPathFactory) -> ControllerService:
+    # Tool-call tests share one service; each keeps its own tmp_path sandbox root and audit logs.
+    # None of them assert on model output or validation, so that DAG suffix is a no-op.
+    return ControllerService(
+        memory_manager=build_memory(tmp_path_factory.mktemp("tool-memory")),
+        hardware_service=StubHardwareService(),
+        model_registry=StubModelRegistry(),
+        node_overrides={"llm_worker": NoopNode(), "validator": NoopNode()},
+    )
+
+
+# Target of the patched create_default_audit_logger; tests point it at their own tmp_path
+_DEFAULT_AUDIT_PATH: dict[str, Path | None] = {"path": None}
+
+
+@pytest.fixture(scope="module")
+def default_audit_path() -> Iterator[dict[str, Path | None]]:
+    with pytest.MonkeyPatch.context() as patcher:
+        patcher.setattr(
+            audit_logger_module,
+            "create_default_audit_logger",
+            lambda: SecurityAuditLogger(_DEFAULT_AUDIT_PATH["path"]),
+        )
+        yield _DEFAULT_AUDIT_PATH
+    _DEFAULT_AUDIT_PATH["path"] = None
+
+
+@pytest.fixture(scope="module")
+def tool_root(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    # Read-only sandbox shared by the listing tests; nothing may write into it
+    root = tmp_path_factory.mktemp("tool-root")
+    (root / "alpha.txt").write_text("alpha", encoding="utf-8")
+    return root
+
+
 class StubSTTModelRegistry(StubModelRegistry):
     def select_model(self, profile: str, hardware: str, role: str) -> dict | None:
         _ = profile
@@ -175,30 +286,29 @@ def test_controller_escalation_registry_is_populated_with_real_providers() -> No
     assert isinstance(registry["grok"], EscalationProviderBase)
 
 
-def test_controller_service_run_executes_nodes_and_handles_llm_gracefully() -> None:
-    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
-        service = ControllerService(
-            memory_manager=build_memory(tmp_dir),
-            hardware_service=StubHardwareService(),
-            model_registry=StubModelRegistry(),
-        )
+def test_controller_service_run_executes_nodes_and_handles_llm_gracefully(tmp_path: Path) -> None:
+    service = ControllerService(
+        memory_manager=build_memory(tmp_path),
+        hardware_service=StubHardwareService(),
+        model_registry=StubModelRegistry(),
+    )
 
-        result = service.run(user_input="test code")
+    result = service.run(user_input="test code")
 
-        assert result["final_state"] in {"ARCHIVE", "FAILED"}
-        assert "context" in result
+    assert result["final_state"] in {"ARCHIVE", "FAILED"}
+    assert "context" in result
 
-        context = result["context"]
-        assert context.get("intent") == "code"
-        assert context.get("selected_model") is None
-        assert context.get("llm_model_path") == ""
+    context = result["context"]
+    assert context.get("intent") == "code"
+    assert context.get("selected_model") is None
+    assert context.get("llm_model_path") == ""
 
-        assert "llm_output" in context
-        assert isinstance(context["llm_output"], str)
-        assert "Local model missing" in context["llm_output"]
+    assert "llm_output" in context
+    assert isinstance(context["llm_output"], str)
+    assert "Local model missing" in context["llm_output"]
 
 
-def test_controller_semantic_write_occurs_once_on_successful_validated_flow(monkeypatch) -> None:
+def test_controller_semantic_write_occurs_once_on_successful_validated_flow(monkeypatch, tmp_path: Path) -> None:
     from backend.workflow.nodes.llm_worker_node import LLMWorkerNode
     from backend.workflow.nodes.validator_node import ValidatorNode
 
@@ -220,28 +330,27 @@ def test_controller_semantic_write_occurs_once_on_successful_validated_flow(monk
     monkeypatch.setattr(LLMWorkerNode, "execute", _stub_llm_execute)
     monkeypatch.setattr(ValidatorNode, "execute", _stub_validator_execute)
 
-    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
-        memory = build_recording_memory(tmp_dir)
-        service = ControllerService(
-            memory_manager=memory,
-            hardware_service=StubHardwareService(),
-            model_registry=PresentModelRegistry(),
-        )
+    memory = build_recording_memory(tmp_path)
+    service = ControllerService(
+        memory_manager=memory,
+        hardware_service=StubHardwareService(),
+        model_registry=PresentModelRegistry(),
+    )
 
-        result = service.run(user_input="persist semantic output")
+    result = service.run(user_input="persist semantic output")
 
-        assert result["final_state"] == "ARCHIVE"
-        assert len(memory.semantic_writes) == 1
+    assert result["final_state"] == "ARCHIVE"
+    assert len(memory.semantic_writes) == 1
 
-        write = memory.semantic_writes[0]
-        assert write["text"] == expected_output
-        assert write["metadata"]["task_id"] == result["task_id"]
-        assert write["metadata"]["source"] == "assistant_final"
-        assert write["metadata"]["intent"] == "chat"
-        assert write["metadata"]["final_state_hint"] == "validated"
+    write = memory.semantic_writes[0]
+    assert write["text"] == expected_output
+    assert write["metadata"]["task_id"] == result["task_id"]
+    assert write["metadata"]["source"] == "assistant_final"
+    assert write["metadata"]["intent"] == "chat"
+    assert write["metadata"]["final_state_hint"] == "validated"
 
 
-def test_controller_semantic_write_skips_invalid_and_empty_paths(monkeypatch) -> None:
+def test_controller_semantic_write_skips_invalid_and_empty_paths(monkeypatch, tmp_path: Path) -> None:
     from backend.workflow.nodes.llm_worker_node import LLMWorkerNode
     from backend.workflow.nodes.validator_node import ValidatorNode
 
@@ -274,37 +383,35 @@ def test_controller_semantic_write_skips_invalid_and_empty_paths(monkeypatch) ->
     # Case A: validation fails -> no semantic write.
     monkeypatch.setattr(LLMWorkerNode, "execute", _stub_llm_execute_long)
     monkeypatch.setattr(ValidatorNode, "execute", _stub_validator_fail)
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        memory = build_recording_memory(tmp_dir)
-        service = ControllerService(
-            memory_manager=memory,
-            hardware_service=StubHardwareService(),
-            model_registry=PresentModelRegistry(),
-        )
+    memory = build_recording_memory(tmp_path / "invalid")
+    service = ControllerService(
+        memory_manager=memory,
+        hardware_service=StubHardwareService(),
+        model_registry=PresentModelRegistry(),
+    )
 
-        result = service.run(user_input="invalid flow")
+    result = service.run(user_input="invalid flow")
 
-        assert result["final_state"] == "FAILED"
-        assert memory.semantic_writes == []
+    assert result["final_state"] == "FAILED"
+    assert memory.semantic_writes == []
 
     # Case B: validation passes but output empty -> no semantic write.
     monkeypatch.setattr(LLMWorkerNode, "execute", _stub_llm_execute_empty)
     monkeypatch.setattr(ValidatorNode, "execute", _stub_validator_pass)
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        memory = build_recording_memory(tmp_dir)
-        service = ControllerService(
-            memory_manager=memory,
-            hardware_service=StubHardwareService(),
-            model_registry=PresentModelRegistry(),
-        )
+    memory = build_recording_memory(tmp_path / "empty")
+    service = ControllerService(
+        memory_manager=memory,
+        hardware_service=StubHardwareService(),
+        model_registry=PresentModelRegistry(),
+    )
 
-        result = service.run(user_input="empty output flow")
+    result = service.run(user_input="empty output flow")
 
-        assert result["final_state"] == "ARCHIVE"
-        assert memory.semantic_writes == []
+    assert result["final_state"] == "ARCHIVE"
+    assert memory.semantic_writes == []
 
 
-def test_controller_result_redaction_enabled_redacts_persisted_assistant_and_semantic_write(monkeypatch) -> None:
+def test_controller_result_redaction_enabled_redacts_persisted_assistant_and_semantic_write(monkeypatch, tmp_path: Path) -> None:
     from backend.workflow.nodes.llm_worker_node import LLMWorkerNode
     from backend.workflow.nodes.validator_node import ValidatorNode
 
@@ -330,34 +437,33 @@ def test_controller_result_redaction_enabled_redacts_persisted_assistant_and_sem
     monkeypatch.setattr(LLMWorkerNode, "execute", _stub_llm_execute)
     monkeypatch.setattr(ValidatorNode, "execute", _stub_validator_execute)
 
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        memory = build_recording_memory(tmp_dir)
-        service = ControllerService(
-            memory_manager=memory,
-            hardware_service=StubHardwareService(),
-            model_registry=PresentModelRegistry(),
-        )
+    memory = build_recording_memory(tmp_path)
+    service = ControllerService(
+        memory_manager=memory,
+        hardware_service=StubHardwareService(),
+        model_registry=PresentModelRegistry(),
+    )
 
-        result = service.run(user_input="redact result output")
+    result = service.run(user_input="redact result output")
 
-        assert result["final_state"] == "ARCHIVE"
+    assert result["final_state"] == "ARCHIVE"
 
-        task_state = memory.get_task_state(result["task_id"])
-        assert isinstance(task_state, dict)
-        messages = task_state.get("messages", [])
-        assistant_messages = [m for m in messages if m.get("role") == "assistant"]
-        assert assistant_messages
-        persisted_assistant = str(assistant_messages[-1].get("content", ""))
-        assert "test@example.com" not in persisted_assistant
-        assert "[EMAIL_REDACTED]" in persisted_assistant
+    task_state = memory.get_task_state(result["task_id"])
+    assert isinstance(task_state, dict)
+    messages = task_state.get("messages", [])
+    assistant_messages = [m for m in messages if m.get("role") == "assistant"]
+    assert assistant_messages
+    persisted_assistant = str(assistant_messages[-1].get("content", ""))
+    assert "test@example.com" not in persisted_assistant
+    assert "[EMAIL_REDACTED]" in persisted_assistant
 
-        assert len(memory.semantic_writes) == 1
-        semantic_text = str(memory.semantic_writes[0].get("text", ""))
-        assert "test@example.com" not in semantic_text
-        assert "[EMAIL_REDACTED]" in semantic_text
+    assert len(memory.semantic_writes) == 1
+    semantic_text = str(memory.semantic_writes[0].get("text", ""))
+    assert "test@example.com" not in semantic_text
+    assert "[EMAIL_REDACTED]" in semantic_text
 
 
-def test_controller_result_redaction_disabled_preserves_persisted_assistant_output(monkeypatch) -> None:
+def test_controller_result_redaction_disabled_preserves_persisted_assistant_output(monkeypatch, tmp_path: Path) -> None:
     from backend.workflow.nodes.llm_worker_node import LLMWorkerNode
     from backend.workflow.nodes.validator_node import ValidatorNode
 
@@ -383,28 +489,27 @@ def test_controller_result_redaction_disabled_preserves_persisted_assistant_outp
     monkeypatch.setattr(LLMWorkerNode, "execute", _stub_llm_execute)
     monkeypatch.setattr(ValidatorNode, "execute", _stub_validator_execute)
 
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        memory = build_recording_memory(tmp_dir)
-        service = ControllerService(
-            memory_manager=memory,
-            hardware_service=StubHardwareService(),
-            model_registry=PresentModelRegistry(),
-        )
+    memory = build_recording_memory(tmp_path)
+    service = ControllerService(
+        memory_manager=memory,
+        hardware_service=StubHardwareService(),
+        model_registry=PresentModelRegistry(),
+    )
 
-        result = service.run(user_input="do not redact result output")
+    result = service.run(user_input="do not redact result output")
 
-        assert result["final_state"] == "ARCHIVE"
+    assert result["final_state"] == "ARCHIVE"
 
-        task_state = memory.get_task_state(result["task_id"])
-        assert isinstance(task_state, dict)
-        messages = task_state.get("messages", [])
-        assistant_messages = [m for m in messages if m.get("role") == "assistant"]
-        assert assistant_messages
-        persisted_assistant = str(assistant_messages[-1].get("content", ""))
-        assert persisted_assistant == pii_output
+    task_state = memory.get_task_state(result["task_id"])
+    assert isinstance(task_state, dict)
+    messages = task_state.get("messages", [])
+    assistant_messages = [m for m in messages if m.get("role") == "assistant"]
+    assert assistant_messages
+    persisted_assistant = str(assistant_messages[-1].get("content", ""))
+    assert persisted_assistant == pii_output
 
 
-def test_controller_local_model_found_sets_escalation_not_attempted(monkeypatch) -> None:
+def test_controller_local_model_found_sets_escalation_not_attempted(monkeypatch, tmp_path: Path) -> None:
     class _Settings:
         MODEL_PATH = "models/"
         ALLOW_MODEL_ESCALATION = True
@@ -413,21 +518,20 @@ def test_controller_local_model_found_sets_escalation_not_attempted(monkeypatch)
 
     monkeypatch.setattr(controller_service_module, "Settings", lambda: _Settings)
 
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        service = ControllerService(
-            memory_manager=build_memory(tmp_dir),
-            hardware_service=StubHardwareService(),
-            model_registry=PresentModelRegistry(),
-        )
+    service = ControllerService(
+        memory_manager=build_memory(tmp_path),
+        hardware_service=StubHardwareService(),
+        model_registry=PresentModelRegistry(),
+    )
 
-        result = service.run(user_input="hello")
-        context = result["context"]
+    result = service.run(user_input="hello")
+    context = result["context"]
 
-        assert context.get("escalation_status") == "not_attempted"
-        assert context.get("llm_model_path") == "models/local.gguf"
+    assert context.get("escalation_status") == "not_attempted"
+    assert context.get("llm_model_path") == "models/local.gguf"
 
 
-def test_controller_escalation_denied_preserves_fallback(monkeypatch) -> None:
+def test_controller_escalation_denied_preserves_fallback(monkeypatch, tmp_path: Path) -> None:
     class _Settings:
         MODEL_PATH = "models/"
         ALLOW_MODEL_ESCALATION = False
@@ -436,24 +540,23 @@ def test_controller_escalation_denied_preserves_fallback(monkeypatch) -> None:
 
     monkeypatch.setattr(controller_service_module, "Settings", lambda: _Settings)
 
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        service = ControllerService(
-            memory_manager=build_memory(tmp_dir),
-            hardware_service=StubHardwareService(),
-            model_registry=StubModelRegistry(),
-        )
+    service = ControllerService(
+        memory_manager=build_memory(tmp_path),
+        hardware_service=StubHardwareService(),
+        model_registry=StubModelRegistry(),
+    )
 
-        result = service.run(user_input="code help")
-        context = result["context"]
+    result = service.run(user_input="code help")
+    context = result["context"]
 
-        assert context.get("escalation_status") == "denied"
-        assert context.get("escalation_code") == "permission_denied"
-        assert isinstance(context.get("escalation_reason"), str)
-        assert context.get("skip_llm") is True
-        assert "Local model missing" in str(context.get("llm_output", ""))
+    assert context.get("escalation_status") == "denied"
+    assert context.get("escalation_code") == "permission_denied"
+    assert isinstance(context.get("escalation_reason"), str)
+    assert context.get("skip_llm") is True
+    assert "Local model missing" in str(context.get("llm_output", ""))
 
 
-def test_controller_escalation_denied_when_provider_empty(monkeypatch) -> None:
+def test_controller_escalation_denied_when_provider_empty(monkeypatch, tmp_path: Path) -> None:
     class _Settings:
         MODEL_PATH = "models/"
         ALLOW_MODEL_ESCALATION = True
@@ -462,24 +565,23 @@ def test_controller_escalation_denied_when_provider_empty(monkeypatch) -> None:
 
     monkeypatch.setattr(controller_service_module, "Settings", lambda: _Settings)
 
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        service = ControllerService(
-            memory_manager=build_memory(tmp_dir),
-            hardware_service=StubHardwareService(),
-            model_registry=StubModelRegistry(),
-        )
+    service = ControllerService(
+        memory_manager=build_memory(tmp_path),
+        hardware_service=StubHardwareService(),
+        model_registry=StubModelRegistry(),
+    )
 
-        result = service.run(user_input="code help")
-        context = result["context"]
+    result = service.run(user_input="code help")
+    context = result["context"]
 
-        assert context.get("escalation_status") == "denied"
-        assert context.get("escalation_code") == "provider_not_configured"
-        assert isinstance(context.get("escalation_reason"), str)
-        assert context.get("skip_llm") is True
-        assert "Local model missing" in str(context.get("llm_output", ""))
+    assert context.get("escalation_status") == "denied"
+    assert context.get("escalation_code") == "provider_not_configured"
+    assert isinstance(context.get("escalation_reason"), str)
+    assert context.get("skip_llm") is True
+    assert "Local model missing" in str(context.get("llm_output", ""))
 
 
-def test_controller_escalation_denied_when_provider_key_missing(monkeypatch) -> None:
+def test_controller_escalation_denied_when_provider_key_missing(monkeypatch, tmp_path: Path) -> None:
     class _Settings:
         MODEL_PATH = "models/"
         ALLOW_MODEL_ESCALATION = True
@@ -489,24 +591,23 @@ def test_controller_escalation_denied_when_provider_key_missing(monkeypatch) ->
     monkeypatch.setattr(controller_service_module, "Settings", lambda: _Settings)
     monkeypatch.delenv("OPENAI_API_KEY", raising=False)
 
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        service = ControllerService(
-            memory_manager=build_memory(tmp_dir),
-            hardware_service=StubHardwareService(),
-            model_registry=StubModelRegistry(),
-        )
+    service = ControllerService(
+        memory_manager=build_memory(tmp_path),
+        hardware_service=StubHardwareService(),
+        model_registry=StubModelRegistry(),
+    )
 
-        result = service.run(user_input="code help")
-        context = result["context"]
+    result = service.run(user_input="code help")
+    context = result["context"]
 
-        assert context.get("escalation_status") == "denied"
-        assert context.get("escalation_code") == "provider_key_missing"
-        assert isinstance(context.get("escalation_reason"), str)
-        assert context.get("skip_llm") is True
-        assert "Local model missing" in str(context.get("llm_output", ""))
+    assert context.get("escalation_status") == "denied"
+    assert context.get("escalation_code") == "provider_key_missing"
+    assert isinstance(context.get("escalation_reason"), str)
+    assert context.get("skip_llm") is True
+    assert "Local model missing" in str(context.get("llm_output", ""))
 
 
-def test_controller_escalation_denied_when_budget_zero(monkeypatch) -> None:
+def test_controller_escalation_denied_when_budget_zero(monkeypatch, tmp_path: Path) -> None:
     class _Settings:
         MODEL_PATH = "models/"
         ALLOW_MODEL_ESCALATION = True
@@ -516,24 +617,23 @@ def test_controller_escalation_denied_when_budget_zero(monkeypatch) -> None:
     monkeypatch.setattr(controller_service_module, "Settings", lambda: _Settings)
     monkeypatch.setenv("OPENAI_API_KEY", "test-openai-key")
 
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        service = ControllerService(
-            memory_manager=build_memory(tmp_dir),
-            hardware_service=StubHardwareService(),
-            model_registry=StubModelRegistry(),
-        )
+    service = ControllerService(
+        memory_manager=build_memory(tmp_path),
+        hardware_service=StubHardwareService(),
+        model_registry=StubModelRegistry(),
+    )
 
-        result = service.run(user_input="code help")
-        context = result["context"]
+    result = service.run(user_input="code help")
+    context = result["context"]
 
-        assert context.get("escalation_status") == "denied"
-        assert context.get("escalation_code") == "budget_not_allocated"
-        assert isinstance(context.get("escalation_reason"), str)
-        assert context.get("skip_llm") is True
-        assert "Local model missing" in str(context.get("llm_output", ""))
+    assert context.get("escalation_status") == "denied"
+    assert context.get("escalation_code") == "budget_not_allocated"
+    assert isinstance(context.get("escalation_reason"), str)
+    assert context.get("skip_llm") is True
+    assert "Local model missing" in str(context.get("llm_output", ""))
 
 
-def test_controller_escalation_allowed_uses_registry_provider_and_redacts_prompt(monkeypatch) -> None:
+def test_controller_escalation_allowed_uses_registry_provider_and_redacts_prompt(monkeypatch, tmp_path: Path) -> None:
     class _Settings:
         MODEL_PATH = "models/"
         ALLOW_MODEL_ESCALATION = True
@@ -546,25 +646,24 @@ def test_controller_escalation_allowed_uses_registry_provider_and_redacts_prompt
     provider = StubEscalationProvider(ok=True, output="escalated-response")
     monkeypatch.setitem(controller_service_module._ESCALATION_PROVIDER_REGISTRY, "openai", provider)
 
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        service = ControllerService(
-            memory_manager=build_memory(tmp_dir),
-            hardware_service=StubHardwareService(),
-            model_registry=StubModelRegistry(),
-        )
+    service = ControllerService(
+        memory_manager=build_memory(tmp_path),
+        hardware_service=StubHardwareService(),
+        model_registry=StubModelRegistry(),
+    )
 
-        result = service.run(user_input="contact me at test@example.com")
-        context = result["context"]
+    result = service.run(user_input="contact me at test@example.com")
+    context = result["context"]
 
-        assert context.get("escalation_status") == "escalated"
-        assert context.get("escalation_redaction_applied") is True
-        assert context.get("llm_output") == "escalated-response"
-        assert context.get("skip_llm") is False
-        assert "test@example.com" not in provider.last_prompt
-        assert "[EMAIL_REDACTED]" in provider.last_prompt
+    assert context.get("escalation_status") == "escalated"
+    assert context.get("escalation_redaction_applied") is True
+    assert context.get("llm_output") == "escalated-response"
+    assert context.get("skip_llm") is False
+    assert "test@example.com" not in provider.last_prompt
+    assert "[EMAIL_REDACTED]" in provider.last_prompt
 
 
-def test_controller_escalation_allowed_uses_registered_anthropic_provider(monkeypatch) -> None:
+def test_controller_escalation_allowed_uses_registered_anthropic_provider(monkeypatch, tmp_path: Path) -> None:
     class _Settings:
         MODEL_PATH = "models/"
         ALLOW_MODEL_ESCALATION = True
@@ -577,24 +676,23 @@ def test_controller_escalation_allowed_uses_registered_anthropic_provider(monkey
     provider = StubEscalationProvider(ok=True, output="anthropic-escalated-response")
     monkeypatch.setitem(controller_service_module._ESCALATION_PROVIDER_REGISTRY, "anthropic", provider)
 
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        service = ControllerService(
-            memory_manager=build_memory(tmp_dir),
-            hardware_service=StubHardwareService(),
-            model_registry=StubModelRegistry(),
-        )
+    service = ControllerService(
+        memory_manager=build_memory(tmp_path),
+        hardware_service=StubHardwareService(),
+        model_registry=StubModelRegistry(),
+    )
 
-        result = service.run(user_input="contact me at test@example.com")
-        context = result["context"]
+    result = service.run(user_input="contact me at test@example.com")
+    context = result["context"]
 
-        assert context.get("escalation_status") == "escalated"
-        assert context.get("llm_output") == "anthropic-escalated-response"
-        assert context.get("skip_llm") is False
-        assert "test@example.com" not in provider.last_prompt
-        assert "[EMAIL_REDACTED]" in provider.last_prompt
+    assert context.get("escalation_status") == "escalated"
+    assert context.get("llm_output") == "anthropic-escalated-response"
+    assert context.get("skip_llm") is False
+    assert "test@example.com" not in provider.last_prompt
+    assert "[EMAIL_REDACTED]" in provider.last_prompt
 
 
-def test_controller_escalation_allowed_provider_failure_sets_failed(monkeypatch) -> None:
+def test_controller_escalation_allowed_provider_failure_sets_failed(monkeypatch, tmp_path: Path) -> None:
     class _Settings:
         MODEL_PATH = "models/"
         ALLOW_MODEL_ESCALATION = True
@@ -607,22 +705,21 @@ def test_controller_escalation_allowed_provider_failure_sets_failed(monkeypatch)
     provider = StubEscalationProvider(ok=False, output="", error="provider failure")
     monkeypatch.setitem(controller_service_module._ESCALATION_PROVIDER_REGISTRY, "openai", provider)
 
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        service = ControllerService(
-            memory_manager=build_memory(tmp_dir),
-            hardware_service=StubHardwareService(),
-            model_registry=MissingModelPathRegistry(),
-        )
+    service = ControllerService(
+        memory_manager=build_memory(tmp_path),
+        hardware_service=StubHardwareService(),
+        model_registry=MissingModelPathRegistry(),
+    )
 
-        result = service.run(user_input="trigger missing path")
-        context = result["context"]
+    result = service.run(user_input="trigger missing path")
+    context = result["context"]
 
-        assert context.get("escalation_status") == "failed"
-        assert context.get("escalation_error") == "provider failure"
-        assert "Local model missing" in str(context.get("llm_output", ""))
+    assert context.get("escalation_status") == "failed"
+    assert context.get("escalation_error") == "provider failure"
+    assert "Local model missing" in str(context.get("llm_output", ""))
 
 
-def test_controller_ollama_success_skips_cloud_escalation_path(monkeypatch) -> None:
+def test_controller_ollama_success_skips_cloud_escalation_path(monkeypatch, tmp_path: Path) -> None:
     class _Settings:
         MODEL_PATH = "models/"
         ALLOW_OLLAMA_ESCALATION = True
@@ -648,22 +745,21 @@ def test_controller_ollama_success_skips_cloud_escalation_path(monkeypatch) -> N
 
     monkeypatch.setattr(controller_service_module, "decide_escalation", _unexpected_cloud_policy_call)
 
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        service = ControllerService(
-            memory_manager=build_memory(tmp_dir),
-            hardware_service=StubHardwareService(),
-            model_registry=StubModelRegistry(),
-        )
+    service = ControllerService(
+        memory_manager=build_memory(tmp_path),
+        hardware_service=StubHardwareService(),
+        model_registry=StubModelRegistry(),
+    )
 
-        result = service.run(user_input="hello")
-        context = result["context"]
+    result = service.run(user_input="hello")
+    context = result["context"]
 
-        assert context.get("escalation_status") == "escalated"
-        assert context.get("escalation_provider_used") == "ollama"
-        assert context.get("llm_output") == "ollama-response"
+    assert context.get("escalation_status") == "escalated"
+    assert context.get("escalation_provider_used") == "ollama"
+    assert context.get("llm_output") == "ollama-response"
 
 
-def test_controller_ollama_failure_falls_through_to_cloud_escalation(monkeypatch) -> None:
+def test_controller_ollama_failure_falls_through_to_cloud_escalation(monkeypatch, tmp_path: Path) -> None:
     class _Settings:
         MODEL_PATH = "models/"
         ALLOW_OLLAMA_ESCALATION = True
@@ -692,22 +788,21 @@ def test_controller_ollama_failure_falls_through_to_cloud_escalation(monkeypatch
     provider = StubEscalationProvider(ok=True, output="cloud-response")
     monkeypatch.setitem(controller_service_module._ESCALATION_PROVIDER_REGISTRY, "openai", provider)
 
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        service = ControllerService(
-            memory_manager=build_memory(tmp_dir),
-            hardware_service=StubHardwareService(),
-            model_registry=StubModelRegistry(),
-        )
+    service = ControllerService(
+        memory_manager=build_memory(tmp_path),
+        hardware_service=StubHardwareService(),
+        model_registry=StubModelRegistry(),
+    )
 
-        result = service.run(user_input="hello")
-        context = result["context"]
+    result = service.run(user_input="hello")
+    context = result["context"]
 
-        assert context.get("ollama_fallback_reason") == "ollama_unreachable"
-        assert context.get("escalation_status") == "escalated"
-        assert context.get("llm_output") == "cloud-response"
+    assert context.get("ollama_fallback_reason") == "ollama_unreachable"
+    assert context.get("escalation_status") == "escalated"
+    assert context.get("llm_output") == "cloud-response"
 
 
-def test_controller_ollama_disabled_falls_through_to_cloud_escalation(monkeypatch) -> None:
+def test_controller_ollama_disabled_falls_through_to_cloud_escalation(monkeypatch, tmp_path: Path) -> None:
     class _Settings:
         MODEL_PATH = "models/"
         ALLOW_OLLAMA_ESCALATION = False
@@ -736,21 +831,20 @@ def test_controller_ollama_disabled_falls_through_to_cloud_escalation(monkeypatc
     provider = StubEscalationProvider(ok=True, output="cloud-response-disabled")
     monkeypatch.setitem(controller_service_module._ESCALATION_PROVIDER_REGISTRY, "openai", provider)
 
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        service = ControllerService(
-            memory_manager=build_memory(tmp_dir),
-            hardware_service=StubHardwareService(),
-            model_registry=StubModelRegistry(),
-        )
+    service = ControllerService(
+        memory_manager=build_memory(tmp_path),
+        hardware_service=StubHardwareService(),
+        model_registry=StubModelRegistry(),
+    )
 
-        result = service.run(user_input="hello")
-        context = result["context"]
+    result = service.run(user_input="hello")
+    context = result["context"]
 
-        assert context.get("escalation_status") == "escalated"
-        assert context.get("llm_output") == "cloud-response-disabled"
+    assert context.get("escalation_status") == "escalated"
+    assert context.get("llm_output") == "cloud-response-disabled"
 
 
-def test_controller_ollama_enabled_with_blank_model_falls_through_to_cloud(monkeypatch) -> None:
+def test_controller_ollama_enabled_with_blank_model_falls_through_to_cloud(monkeypatch, tmp_path: Path) -> None:
     class _Settings:
         MODEL_PATH = "models/"
         ALLOW_OLLAMA_ESCALATION = True
@@ -778,22 +872,50 @@ def test_controller_ollama_enabled_with_blank_model_falls_through_to_cloud(monke
     provider = StubEscalationProvider(ok=True, output="cloud-response-blank-model")
     monkeypatch.setitem(controller_service_module._ESCALATION_PROVIDER_REGISTRY, "openai", provider)
 
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        service = ControllerService(
-            memory_manager=build_memory(tmp_dir),
-            hardware_service=StubHardwareService(),
-            model_registry=StubModelRegistry(),
-        )
+    service = ControllerService(
+        memory_manager=build_memory(tmp_path),
+        hardware_service=StubHardwareService(),
+        model_registry=StubModelRegistry(),
+    )
 
-        result = service.run(user_input="hello")
-        context = result["context"]
+    result = service.run(user_input="hello")
+    context = result["context"]
 
-        assert context.get("escalation_status") == "escalated"
-        assert context.get("llm_output") == "cloud-response-blank-model"
-        assert context.get("escalation_provider_used") != "ollama"
+    assert context.get("escalation_status") == "escalated"
+    assert context.get("llm_output") == "cloud-response-blank-model"
+    assert context.get("escalation_provider_used") != "ollama"
 
 
-def test_controller_service_run_uses_dag_executor_path(monkeypatch) -> None:
+def test_controller_service_node_overrides_replace_registry_entries(tmp_path: Path) -> None:
+    class _PassingValidator(BaseNode):
+        def execute(self, context: dict) -> dict:
+            context["is_valid"] = True
+            return context
+
+    service = ControllerService(
+        memory_manager=build_memory(tmp_path),
+        hardware_service=StubHardwareService(),
+        model_registry=PresentModelRegistry(),
+        node_overrides={"llm_worker": NoopNode(), "validator": _PassingValidator()},
+    )
+
+    result = service.run(user_input="hello")
+
+    assert result["final_state"] == "ARCHIVE"
+    context = result["context"]
+    assert context["workflow_execution_order"] == [
+        "router",
+        "context_builder",
+        "llm_worker",
+        "validator",
+    ]
+
+    node_types = dict(fetch_node_events(service.memory, result["task_id"], "node_type"))
+    assert node_types["llm_worker"] == "NoopNode"
+    assert node_types["validator"] == "_PassingValidator"
+
+
+def test_controller_service_run_uses_dag_executor_path(monkeypatch, tmp_path: Path) -> None:
     original = DAGExecutor.resolve_execution_order
     calls = {"count": 0}
 
@@ -803,32 +925,31 @@ def test_controller_service_run_uses_dag_executor_path(monkeypatch) -> None:
 
     monkeypatch.setattr(DAGExecutor, "resolve_execution_order", _wrapped)
 
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        service = ControllerService(
-            memory_manager=build_memory(tmp_dir),
-            hardware_service=StubHardwareService(),
-            model_registry=StubModelRegistry(),
-        )
+    service = ControllerService(
+        memory_manager=build_memory(tmp_path),
+        hardware_service=StubHardwareService(),
+        model_registry=StubModelRegistry(),
+    )
 
-        result = service.run(user_input="hello")
+    result = service.run(user_input="hello")
 
-        assert calls["count"] == 1
-        assert result["final_state"] in {"ARCHIVE", "FAILED"}
-        context = result["context"]
-        assert context["workflow_execution_order"] == [
-            "router",
-            "context_builder",
-            "llm_worker",
-            "validator",
-        ]
-        assert context["workflow_graph"]["entry"] == "router"
+    assert calls["count"] == 1
+    assert result["final_state"] in {"ARCHIVE", "FAILED"}
+    context = result["context"]
+    assert context["workflow_execution_order"] == [
+        "router",
+        "context_builder",
+        "llm_worker",
+        "validator",
+    ]
+    assert context["workflow_graph"]["entry"] == "router"
 
-        task_state = service.memory.get_task_state(result["task_id"])
-        assert isinstance(task_state, dict)
-        assert task_state.get("workflow_graph", {}).get("entry") == "router"
+    task_state = service.memory.get_task_state(result["task_id"])
+    assert isinstance(task_state, dict)
+    assert task_state.get("workflow_graph", {}).get("entry") == "router"
 
 
-def test_controller_service_run_planned_mode_aggregates_subtask_outputs() -> None:
+def test_controller_service_run_planned_mode_aggregates_subtask_outputs(tmp_path: Path) -> None:
     class StubPlanningLLMModelRegistry(StubModelRegistry):
         def select_model(self, profile: str, hardware: str, role: str) -> dict | None:
             return {"id": "stub-model", "path": "models/stub.gguf"}
@@ -844,87 +965,68 @@ def test_controller_service_run_planned_mode_aggregates_subtask_outputs() -> Non
             context["llm_stream_chunks"] = [context["llm_output"]]
             return context
 
-    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
-        service = ControllerService(
-            memory_manager=build_memory(tmp_dir),
-            hardware_service=StubHardwareService(),
-            model_registry=StubPlanningLLMModelRegistry(),
-        )
-        service.registry = StubPlanningLLMModelRegistry()
-        service_llm_worker_original = service.run
-
-        from backend.workflow.nodes.llm_worker_node import LLMWorkerNode
-
-        original_execute = LLMWorkerNode.execute
-        LLMWorkerNode.execute = StubPlanningLLMWorker().execute  # type: ignore[method-assign]
-        try:
-            result = service.run(
-                user_input=(
-                    "This is a long prompt designed to trigger planning and produce multiple segments; "
-                    "collect requirements; then draft approach; next provide verification."
-                )
+    service = ControllerService(
+        memory_manager=build_memory(tmp_path),
+        hardware_service=StubHardwareService(),
+        model_registry=StubPlanningLLMModelRegistry(),
+    )
+    service.registry = StubPlanningLLMModelRegistry()
+    service_llm_worker_original = service.run
+
+    from backend.workflow.nodes.llm_worker_node import LLMWorkerNode
+
+    original_execute = LLMWorkerNode.execute
+    LLMWorkerNode.execute = StubPlanningLLMWorker().execute  # type: ignore[method-assign]
+    try:
+        result = service.run(
+            user_input=(
+                "This is a long prompt designed to trigger planning and produce multiple segments; "
+                "collect requirements; then draft approach; next provide verification."
             )
-        finally:
-            LLMWorkerNode.execute = original_execute  # type: ignore[method-assign]
-            _ = service_llm_worker_original
-
-        assert result["final_state"] in {"ARCHIVE", "FAILED"}
-        context = result["context"]
-        assert context.get("planning_mode") == "planned"
-        assert context.get("planning_subtasks") == [
-            "This is a long prompt designed to trigger planning and produce multiple segments",
-            "collect requirements",
-            "draft approach",
-        ]
-        assert context.get("planning_aggregated_parts") == 3
-        assert context.get("planning_subtask_failures") == []
-        llm_output = str(context.get("llm_output", ""))
-        assert "[Part 1]" in llm_output
-        assert "answer::This is a long prompt designed to trigger planning and produce multiple segments" in llm_output
-        assert "[Part 2]" in llm_output
-        assert "answer::collect requirements" in llm_output
-        assert "[Part 3]" in llm_output
-        assert "answer::draft approach" in llm_output
-
-        with sqlite3.connect(service.memory.episodic.db_path) as conn:
-            subtask_rows = conn.execute(
-                """
-                SELECT status, content
-                FROM decisions
-                WHERE task_id = ? AND action_type = 'dag_subtask_event'
-                ORDER BY id ASC
-                """,
-                (result["task_id"],),
-            ).fetchall()
-
-            dag_rows = conn.execute(
-                """
-                SELECT status, content
-                FROM decisions
-                WHERE task_id = ? AND action_type = 'dag_node_event'
-                ORDER BY id ASC
-                """,
-                (result["task_id"],),
-            ).fetchall()
-
-        assert len(subtask_rows) == 3
-        for idx, (status, content) in enumerate(subtask_rows, start=1):
-            payload = json.loads(content)
-            assert status == payload["status"]
-            assert payload["subtask_index"] == idx
-            assert payload["subtask_count"] == 3
-            assert isinstance(payload["subtask_input_preview"], str)
-            assert isinstance(payload["subtask_output_preview"], str)
-            assert isinstance(payload["subtask_output_empty"], bool)
-
-        # Workflow telemetry surface remains tied to dag_node_event shape only.
-        assert dag_rows
-        dag_payload = json.loads(dag_rows[0][1])
-        assert "event_type" in dag_payload
-        assert "subtask_index" not in dag_payload
-
-
-def test_controller_service_planned_mode_records_empty_subtask_failure_and_still_validates(monkeypatch) -> None:
+        )
+    finally:
+        LLMWorkerNode.execute = original_execute  # type: ignore[method-assign]
+        _ = service_llm_worker_original
+
+    assert result["final_state"] in {"ARCHIVE", "FAILED"}
+    context = result["context"]
+    assert context.get("planning_mode") == "planned"
+    assert context.get("planning_subtasks") == [
+        "This is a long prompt designed to trigger planning and produce multiple segments",
+        "collect requirements",
+        "draft approach",
+    ]
+    assert context.get("planning_aggregated_parts") == 3
+    assert context.get("planning_subtask_failures") == []
+    llm_output = str(context.get("llm_output", ""))
+    assert "[Part 1]" in llm_output
+    assert "answer::This is a long prompt designed to trigger planning and produce multiple segments" in llm_output
+    assert "[Part 2]" in llm_output
+    assert "answer::collect requirements" in llm_output
+    assert "[Part 3]" in llm_output
+    assert "answer::draft approach" in llm_output
+
+    subtask_rows = fetch_decisions(service.memory, result["task_id"], "dag_subtask_event")
+    dag_rows = fetch_decisions(service.memory, result["task_id"], "dag_node_event")
+
+    assert len(subtask_rows) == 3
+    for idx, (status, content) in enumerate(subtask_rows, start=1):
+        payload = orjson.loads(content)
+        assert status == payload["status"]
+        assert payload["subtask_index"] == idx
+        assert payload["subtask_count"] == 3
+        assert isinstance(payload["subtask_input_preview"], str)
+        assert isinstance(payload["subtask_output_preview"], str)
+        assert isinstance(payload["subtask_output_empty"], bool)
+
+    # Workflow telemetry surface remains tied to dag_node_event shape only.
+    assert dag_rows
+    dag_payload = orjson.loads(dag_rows[0][1])
+    assert "event_type" in dag_payload
+    assert "subtask_index" not in dag_payload
+
+
+def test_controller_service_planned_mode_records_empty_subtask_failure_and_still_validates(monkeypatch, tmp_path: Path) -> None:
     class StubPlanningLLMModelRegistry(StubModelRegistry):
         def select_model(self, profile: str, hardware: str, role: str) -> dict | None:
             _ = profile
@@ -961,14 +1063,13 @@ def test_controller_service_planned_mode_records_empty_subtask_failure_and_still
     monkeypatch.setattr(controller_service_module, "build_constrained_plan", _stub_constrained_plan)
     monkeypatch.setattr(LLMWorkerNode, "execute", _stub_llm_execute)
 
-    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
-        service = ControllerService(
-            memory_manager=build_memory(tmp_dir),
-            hardware_service=StubHardwareService(),
-            model_registry=StubPlanningLLMModelRegistry(),
-        )
+    service = ControllerService(
+        memory_manager=build_memory(tmp_path),
+        hardware_service=StubHardwareService(),
+        model_registry=StubPlanningLLMModelRegistry(),
+    )
 
-        result = service.run(user_input="planned test input")
+    result = service.run(user_input="planned test input")
 
     assert result["final_state"] == "ARCHIVE"
     context = result["context"]
@@ -987,7 +1088,7 @@ def test_controller_service_planned_mode_records_empty_subtask_failure_and_still
     assert context.get("is_valid") is True
 
 
-def test_controller_service_upload_planned_mode_collapses_redundant_subtask_outputs(monkeypatch) -> None:
+def test_controller_service_upload_planned_mode_collapses_redundant_subtask_outputs(monkeypatch, tmp_path: Path) -> None:
     class StubPlanningLLMModelRegistry(StubModelRegistry):
         def select_model(self, profile: str, hardware: str, role: str) -> dict | None:
             _ = profile
@@ -1025,186 +1126,125 @@ def test_controller_service_upload_planned_mode_collapses_redundant_subtask_outp
     monkeypatch.setattr(controller_service_module, "build_constrained_plan", _stub_constrained_plan)
     monkeypatch.setattr(LLMWorkerNode, "execute", _stub_llm_execute)
 
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        service = ControllerService(
-            memory_manager=build_memory(tmp_dir),
-            hardware_service=StubHardwareService(),
-            model_registry=StubPlanningLLMModelRegistry(),
-        )
+    service = ControllerService(
+        memory_manager=build_memory(tmp_path),
+        hardware_service=StubHardwareService(),
+        model_registry=StubPlanningLLMModelRegistry(),
+    )
 
-        result = service.run(
-            user_input=(
-                "what is this file?\n\n"
-                "[ATTACHMENT_CONTEXT_BEGIN]\n"
-                "filename=oscdimg.txt\n"
-                "set FLDLOC=\"E:/_WORK/OS/W11\"\n"
-                "[ATTACHMENT_CONTEXT_END]"
-            )
+    result = service.run(
+        user_input=(
+            "what is this file?\n\n"
+            "[ATTACHMENT_CONTEXT_BEGIN]\n"
+            "filename=oscdimg.txt\n"
+            "set FLDLOC=\"E:/_WORK/OS/W11\"\n"
+            "[ATTACHMENT_CONTEXT_END]"
         )
+    )
 
-        assert result["final_state"] in {"ARCHIVE", "FAILED"}
-        context = result["context"]
-        assert context.get("planning_mode") == "planned"
-        assert context.get("planning_aggregated_parts") == 1
+    assert result["final_state"] in {"ARCHIVE", "FAILED"}
+    context = result["context"]
+    assert context.get("planning_mode") == "planned"
+    assert context.get("planning_aggregated_parts") == 1
 
-        llm_output = str(context.get("llm_output", ""))
-        assert "[Part 1]" not in llm_output
-        assert "[Part 2]" not in llm_output
-        assert "[Part 3]" not in llm_output
-        assert llm_output == "The file is an ISO image creation script for Windows ADK."
+    llm_output = str(context.get("llm_output", ""))
+    assert "[Part 1]" not in llm_output
+    assert "[Part 2]" not in llm_output
+    assert "[Part 3]" not in llm_output
+    assert llm_output == "The file is an ISO image creation script for Windows ADK."
 
 
-def test_controller_service_run_linear_mode_preserved_for_short_prompt() -> None:
-    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
-        service = ControllerService(
-            memory_manager=build_memory(tmp_dir),
-            hardware_service=StubHardwareService(),
-            model_registry=StubModelRegistry(),
-        )
+def test_controller_service_run_linear_mode_preserved_for_short_prompt(tmp_path: Path) -> None:
+    service = ControllerService(
+        memory_manager=build_memory(tmp_path),
+        hardware_service=StubHardwareService(),
+        model_registry=StubModelRegistry(),
+    )
 
-        result = service.run(user_input="short prompt")
-
-        assert result["final_state"] in {"ARCHIVE", "FAILED"}
-        context = result["context"]
-        assert context.get("planning_mode") == "linear"
-        assert context.get("planning_subtasks") == ["short prompt"]
-        assert context.get("planning_max_subtasks") == 3
-        assert context.get("planning_subtask_failures") == []
-        assert "planning_aggregated_parts" not in context
-
-        with sqlite3.connect(service.memory.episodic.db_path) as conn:
-            subtask_rows = conn.execute(
-                """
-                SELECT status, content
-                FROM decisions
-                WHERE task_id = ? AND action_type = 'dag_subtask_event'
-                ORDER BY id ASC
-                """,
-                (result["task_id"],),
-            ).fetchall()
-
-        assert subtask_rows == []
-
-
-def test_controller_service_fail_closed_on_validator_quality_failure() -> None:
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        service = ControllerService(
-            memory_manager=build_memory(tmp_dir),
-            hardware_service=StubHardwareService(),
-            model_registry=StubModelRegistry(),
-        )
+    result = service.run(user_input="short prompt")
 
-        result = service.run(user_input="hello")
-
-        assert result["final_state"] == "FAILED"
-        context = result["context"]
-        assert context.get("is_valid") is False
-        assert context.get("validation_status") == "failed"
-        assert context.get("validation_errors") == [
-            "model_error_output",
-            "explicit_llm_error",
-        ]
-        assert result.get("error") == "validation_failed"
-
-
-def test_controller_service_run_records_dag_node_trace_events() -> None:
-    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
-        service = ControllerService(
-            memory_manager=build_memory(tmp_dir),
-            hardware_service=StubHardwareService(),
-            model_registry=StubModelRegistry(),
-        )
+    assert result["final_state"] in {"ARCHIVE", "FAILED"}
+    context = result["context"]
+    assert context.get("planning_mode") == "linear"
+    assert context.get("planning_subtasks") == ["short prompt"]
+    assert context.get("planning_max_subtasks") == 3
+    assert context.get("planning_subtask_failures") == []
+    assert "planning_aggregated_parts" not in context
 
-        result = service.run(user_input="trace test")
+    subtask_rows = fetch_decisions(service.memory, result["task_id"], "dag_subtask_event")
 
-        assert result["final_state"] in {"ARCHIVE", "FAILED"}
+    assert subtask_rows == []
 
-        with sqlite3.connect(service.memory.episodic.db_path) as conn:
-            rows = conn.execute(
-                """
-                SELECT status, content
-                FROM decisions
-                WHERE task_id = ? AND action_type = 'dag_node_event'
-                ORDER BY id ASC
-                """,
-                (result["task_id"],),
-            ).fetchall()
 
-        assert rows, "expected dag_node_event entries"
+def test_controller_service_fail_closed_on_validator_quality_failure(tmp_path: Path) -> None:
+    service = ControllerService(
+        memory_manager=build_memory(tmp_path),
+        hardware_service=StubHardwareService(),
+        model_registry=StubModelRegistry(),
+    )
 
-        parsed = [json.loads(content) for _, content in rows]
-        event_types = [row["event_type"] for row in parsed]
+    result = service.run(user_input="hello")
 
-        assert "node_start" in event_types
-        assert "node_end" in event_types
-        assert any(
-            row["node_id"] == "router" and row["event_type"] == "node_start"
-            for row in parsed
-        )
-        assert any(
-            row["node_id"] == "router" and row["event_type"] == "node_end"
-            for row in parsed
-        )
+    assert result["final_state"] == "FAILED"
+    context = result["context"]
+    assert context.get("is_valid") is False
+    assert context.get("validation_status") == "failed"
+    assert context.get("validation_errors") == [
+        "model_error_output",
+        "explicit_llm_error",
+    ]
+    assert result.get("error") == "validation_failed"
+
+
+def test_controller_service_run_records_dag_node_trace_events(tmp_path: Path) -> None:
+    service = ControllerService(
+        memory_manager=build_memory(tmp_path),
+        hardware_service=StubHardwareService(),
+        model_registry=StubModelRegistry(),
+    )
 
+    result = service.run(user_input="trace test")
 
-def test_controller_service_run_executes_tool_call_node_and_records_trace() -> None:
-    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
-        root = Path(tmp_dir) / "tool-root"
-        root.mkdir(parents=True, exist_ok=True)
-        (root / "alpha.txt").write_text("alpha", encoding="utf-8")
+    assert result["final_state"] in {"ARCHIVE", "FAILED"}
 
-        service = ControllerService(
-            memory_manager=build_memory(tmp_dir),
-            hardware_service=StubHardwareService(),
-            model_registry=StubModelRegistry(),
-        )
+    events = fetch_node_events(service.memory, result["task_id"])
 
-        result = service.run(
-            user_input="list files",
-            tool_call={
-                "tool_name": "list_directory",
-                "payload": {"path": str(root)},
-                "allow_write_safe": False,
-                "sandbox_roots": [str(root)],
-            },
-        )
+    assert events, "expected dag_node_event entries"
+    assert {("router", "node_start"), ("router", "node_end")} <= set(events)
 
-        assert result["final_state"] in {"ARCHIVE", "FAILED"}
-        context = result["context"]
-        assert context["workflow_execution_order"] == [
-            "router",
-            "context_builder",
-            "tool_call",
-            "llm_worker",
-            "validator",
-        ]
-        assert context["tool_ok"] is True
-        assert context["tool_result"]["code"] == "ok"
-        assert context["tool_result"]["entries"] == ["alpha.txt"]
-
-        with sqlite3.connect(service.memory.episodic.db_path) as conn:
-            rows = conn.execute(
-                """
-                SELECT status, content
-                FROM decisions
-                WHERE task_id = ? AND action_type = 'dag_node_event'
-                ORDER BY id ASC
-                """,
-                (result["task_id"],),
-            ).fetchall()
-
-        parsed = [json.loads(content) for _, content in rows]
-        assert any(
-            row["node_id"] == "tool_call" and row["event_type"] == "node_start"
-            for row in parsed
-        )
-        assert any(
-            row["node_id"] == "tool_call" and row["event_type"] == "node_end"
-            for row in parsed
-        )
 
+def test_controller_service_run_executes_tool_call_node_and_records_trace(
+    tool_service: ControllerService, tool_root: Path
+) -> None:
+    result = tool_service.run(
+        user_input="list files",
+        tool_call={
+            "tool_name": "list_directory",
+            "payload": {"path": str(tool_root)},
+            "allow_write_safe": False,
+            "sandbox_roots": [str(tool_root)],
+        },
+    )
 
-def test_controller_service_auto_injects_research_tool_call_path() -> None:
+    assert result["final_state"] in {"ARCHIVE", "FAILED"}
+    context = result["context"]
+    assert context["workflow_execution_order"] == [
+        "router",
+        "context_builder",
+        "tool_call",
+        "llm_worker",
+        "validator",
+    ]
+    assert context["tool_ok"] is True
+    assert context["tool_result"]["code"] == "ok"
+    assert context["tool_result"]["entries"] == ["alpha.txt"]
+
+    events = fetch_node_events(tool_service.memory, result["task_id"])
+
+    assert {("tool_call", "node_start"), ("tool_call", "node_end")} <= set(events)
+
+
+def test_controller_service_auto_injects_research_tool_call_path(tmp_path: Path) -> None:
     from backend.workflow.nodes.search_web_node import SearchWebNode
 
     original_execute = SearchWebNode.execute
@@ -1217,33 +1257,32 @@ def test_controller_service_auto_injects_research_tool_call_path() -> None:
         return context
 
     SearchWebNode.execute = _stub_execute  # type: ignore[method-assign]
-    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
-        service = ControllerService(
-            memory_manager=build_memory(tmp_dir),
-            hardware_service=StubHardwareService(),
-            model_registry=StubModelRegistry(),
-        )
+    service = ControllerService(
+        memory_manager=build_memory(tmp_path),
+        hardware_service=StubHardwareService(),
+        model_registry=StubModelRegistry(),
+    )
 
-        try:
-            result = service.run(user_input="research latest python packaging guidance")
-        finally:
-            SearchWebNode.execute = original_execute  # type: ignore[method-assign]
-
-        assert result["final_state"] in {"ARCHIVE", "FAILED"}
-        context = result["context"]
-        assert context.get("intent") == "research"
-        assert context["workflow_execution_order"] == [
-            "router",
-            "context_builder",
-            "search_web",
-            "llm_worker",
-            "validator",
-        ]
-        assert "tool_name" not in context
-        assert context.get("search_ok") is True
-
-
-def test_controller_research_routes_to_search_web_node() -> None:
+    try:
+        result = service.run(user_input="research latest python packaging guidance")
+    finally:
+        SearchWebNode.execute = original_execute  # type: ignore[method-assign]
+
+    assert result["final_state"] in {"ARCHIVE", "FAILED"}
+    context = result["context"]
+    assert context.get("intent") == "research"
+    assert context["workflow_execution_order"] == [
+        "router",
+        "context_builder",
+        "search_web",
+        "llm_worker",
+        "validator",
+    ]
+    assert "tool_name" not in context
+    assert context.get("search_ok") is True
+
+
+def test_controller_research_routes_to_search_web_node(tmp_path: Path) -> None:
     from backend.workflow.nodes.search_web_node import SearchWebNode
 
     original_execute = SearchWebNode.execute
@@ -1256,211 +1295,195 @@ def test_controller_research_routes_to_search_web_node() -> None:
         return context
 
     SearchWebNode.execute = _stub_execute  # type: ignore[method-assign]
-    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
-        service = ControllerService(
-            memory_manager=build_memory(tmp_dir),
-            hardware_service=StubHardwareService(),
-            model_registry=StubModelRegistry(),
-        )
+    service = ControllerService(
+        memory_manager=build_memory(tmp_path),
+        hardware_service=StubHardwareService(),
+        model_registry=StubModelRegistry(),
+    )
 
-        try:
-            result = service.run(user_input="research latest python packaging guidance")
-        finally:
-            SearchWebNode.execute = original_execute  # type: ignore[method-assign]
-
-        assert result["final_state"] in {"ARCHIVE", "FAILED"}
-        context = result["context"]
-        assert context.get("intent") == "research"
-        assert context["workflow_execution_order"] == [
-            "router",
-            "context_builder",
-            "search_web",
-            "llm_worker",
-            "validator",
-        ]
-        assert "tool_name" not in context
-
-
-def test_controller_service_does_not_inject_tool_call_for_chat_intent() -> None:
-    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
-        service = ControllerService(
-            memory_manager=build_memory(tmp_dir),
-            hardware_service=StubHardwareService(),
-            model_registry=StubModelRegistry(),
-        )
+    try:
+        result = service.run(user_input="research latest python packaging guidance")
+    finally:
+        SearchWebNode.execute = original_execute  # type: ignore[method-assign]
 
-        result = service.run(user_input="hello there")
-
-        assert result["final_state"] in {"ARCHIVE", "FAILED"}
-        context = result["context"]
-        assert context.get("intent") == "chat"
-        assert context["workflow_execution_order"] == [
-            "router",
-            "context_builder",
-            "llm_worker",
-            "validator",
-        ]
-        assert "search_web" not in context["workflow_execution_order"]
-        assert "tool_name" not in context
-
-
-def test_controller_chat_does_not_include_search_web_node() -> None:
-    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
-        service = ControllerService(
-            memory_manager=build_memory(tmp_dir),
-            hardware_service=StubHardwareService(),
-            model_registry=StubModelRegistry(),
-        )
+    assert result["final_state"] in {"ARCHIVE", "FAILED"}
+    context = result["context"]
+    assert context.get("intent") == "research"
+    assert context["workflow_execution_order"] == [
+        "router",
+        "context_builder",
+        "search_web",
+        "llm_worker",
+        "validator",
+    ]
+    assert "tool_name" not in context
+
+
+def test_controller_service_does_not_inject_tool_call_for_chat_intent(tmp_path: Path) -> None:
+    service = ControllerService(
+        memory_manager=build_memory(tmp_path),
+        hardware_service=StubHardwareService(),
+        model_registry=StubModelRegistry(),
+    )
 
-        result = service.run(user_input="hello there")
-
-        assert result["final_state"] in {"ARCHIVE", "FAILED"}
-        context = result["context"]
-        assert context.get("intent") == "chat"
-        assert context["workflow_execution_order"] == [
-            "router",
-            "context_builder",
-            "llm_worker",
-            "validator",
-        ]
-        assert "search_web" not in context["workflow_execution_order"]
-        assert "tool_name" not in context
-
-
-def test_controller_service_preserves_code_intent_graph_without_search_web() -> None:
-    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
-        service = ControllerService(
-            memory_manager=build_memory(tmp_dir),
-            hardware_service=StubHardwareService(),
-            model_registry=StubModelRegistry(),
-        )
+    result = service.run(user_input="hello there")
 
-        result = service.run(user_input="test code")
-
-        assert result["final_state"] in {"ARCHIVE", "FAILED"}
-        context = result["context"]
-        assert context.get("intent") == "code"
-        assert context["workflow_execution_order"] == [
-            "router",
-            "context_builder",
-            "llm_worker",
-            "validator",
-        ]
-        assert "search_web" not in context["workflow_execution_order"]
-        assert "tool_name" not in context
-
-
-def test_controller_planning_intent_short_input_forces_planned_mode() -> None:
-    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
-        service = ControllerService(
-            memory_manager=build_memory(tmp_dir),
-            hardware_service=StubHardwareService(),
-            model_registry=StubModelRegistry(),
-        )
+    assert result["final_state"] in {"ARCHIVE", "FAILED"}
+    context = result["context"]
+    assert context.get("intent") == "chat"
+    assert context["workflow_execution_order"] == [
+        "router",
+        "context_builder",
+        "llm_worker",
+        "validator",
+    ]
+    assert "search_web" not in context["workflow_execution_order"]
+    assert "tool_name" not in context
+
+
+def test_controller_chat_does_not_include_search_web_node(tmp_path: Path) -> None:
+    service = ControllerService(
+        memory_manager=build_memory(tmp_path),
+        hardware_service=StubHardwareService(),
+        model_registry=StubModelRegistry(),
+    )
 
-        result = service.run(user_input="Please plan my week")
+    result = service.run(user_input="hello there")
 
-        assert result["final_state"] in {"ARCHIVE", "FAILED"}
-        context = result["context"]
-        assert context.get("intent") == "planning"
-        assert context.get("planning_mode") == "planned"
-        assert context.get("planning_subtasks") == ["Please plan my week"]
+    assert result["final_state"] in {"ARCHIVE", "FAILED"}
+    context = result["context"]
+    assert context.get("intent") == "chat"
+    assert context["workflow_execution_order"] == [
+        "router",
+        "context_builder",
+        "llm_worker",
+        "validator",
+    ]
+    assert "search_web" not in context["workflow_execution_order"]
+    assert "tool_name" not in context
+
+
+def test_controller_service_preserves_code_intent_graph_without_search_web(tmp_path: Path) -> None:
+    service = ControllerService(
+        memory_manager=build_memory(tmp_path),
+        hardware_service=StubHardwareService(),
+        model_registry=StubModelRegistry(),
+    )
 
+    result = service.run(user_input="test code")
 
-def test_controller_writing_intent_short_input_stays_linear_mode() -> None:
-    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
-        service = ControllerService(
-            memory_manager=build_memory(tmp_dir),
-            hardware_service=StubHardwareService(),
-            model_registry=StubModelRegistry(),
-        )
+    assert result["final_state"] in {"ARCHIVE", "FAILED"}
+    context = result["context"]
+    assert context.get("intent") == "code"
+    assert context["workflow_execution_order"] == [
+        "router",
+        "context_builder",
+        "llm_worker",
+        "validator",
+    ]
+    assert "search_web" not in context["workflow_execution_order"]
+    assert "tool_name" not in context
+
+
+def test_controller_planning_intent_short_input_forces_planned_mode(tmp_path: Path) -> None:
+    service = ControllerService(
+        memory_manager=build_memory(tmp_path),
+        hardware_service=StubHardwareService(),
+        model_registry=StubModelRegistry(),
+    )
 
-        result = service.run(user_input="Write a short email")
+    result = service.run(user_input="Please plan my week")
 
-        assert result["final_state"] in {"ARCHIVE", "FAILED"}
-        context = result["context"]
-        assert context.get("intent") == "writing"
-        assert context.get("planning_mode") == "linear"
-        assert context.get("planning_subtask_failures") == []
+    assert result["final_state"] in {"ARCHIVE", "FAILED"}
+    context = result["context"]
+    assert context.get("intent") == "planning"
+    assert context.get("planning_mode") == "planned"
+    assert context.get("planning_subtasks") == ["Please plan my week"]
 
 
-def test_controller_service_research_does_not_overwrite_explicit_tool_call() -> None:
-    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
-        root = Path(tmp_dir) / "tool-root"
-        root.mkdir(parents=True, exist_ok=True)
-        (root / "alpha.txt").write_text("alpha", encoding="utf-8")
+def test_controller_writing_intent_short_input_stays_linear_mode(tmp_path: Path) -> None:
+    service = ControllerService(
+        memory_manager=build_memory(tmp_path),
+        hardware_service=StubHardwareService(),
+        model_registry=StubModelRegistry(),
+    )
 
-        service = ControllerService(
-            memory_manager=build_memory(tmp_dir),
-            hardware_service=StubHardwareService(),
-            model_registry=StubModelRegistry(),
-        )
+    result = service.run(user_input="Write a short email")
 
-        result = service.run(
-            user_input="research local files",
-            tool_call={
-                "tool_name": "list_directory",
-                "payload": {"path": str(root)},
-                "allow_write_safe": False,
-                "sandbox_roots": [str(root)],
-            },
-        )
+    assert result["final_state"] in {"ARCHIVE", "FAILED"}
+    context = result["context"]
+    assert context.get("intent") == "writing"
+    assert context.get("planning_mode") == "linear"
+    assert context.get("planning_subtask_failures") == []
 
-        assert result["final_state"] in {"ARCHIVE", "FAILED"}
-        context = result["context"]
-        assert context.get("intent") == "research"
-        assert context.get("tool_name") == "list_directory"
-        assert context.get("tool_ok") is True
-        assert context.get("tool_result", {}).get("entries") == ["alpha.txt"]
-        assert context["workflow_execution_order"] == [
-            "router",
-            "context_builder",
-            "tool_call",
-            "llm_worker",
-            "validator",
-        ]
-        assert "search_web" not in context["workflow_execution_order"]
-
-
-def test_controller_explicit_tool_call_still_uses_tool_call_node() -> None:
-    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
-        root = Path(tmp_dir) / "tool-root"
-        root.mkdir(parents=True, exist_ok=True)
-        (root / "alpha.txt").write_text("alpha", encoding="utf-8")
-
-        service = ControllerService(
-            memory_manager=build_memory(tmp_dir),
-            hardware_service=StubHardwareService(),
-            model_registry=StubModelRegistry(),
-        )
 
-        result = service.run(
-            user_input="research local files",
-            tool_call={
-                "tool_name": "list_directory",
-                "payload": {"path": str(root)},
-                "allow_write_safe": False,
-                "sandbox_roots": [str(root)],
-            },
-        )
+def test_controller_service_research_does_not_overwrite_explicit_tool_call(tool_root: Path, tmp_path: Path) -> None:
+    service = ControllerService(
+        memory_manager=build_memory(tmp_path),
+        hardware_service=StubHardwareService(),
+        model_registry=StubModelRegistry(),
+    )
+
+    result = service.run(
+        user_input="research local files",
+        tool_call={
+            "tool_name": "list_directory",
+            "payload": {"path": str(tool_root)},
+            "allow_write_safe": False,
+            "sandbox_roots": [str(tool_root)],
+        },
+    )
+
+    assert result["final_state"] in {"ARCHIVE", "FAILED"}
+    context = result["context"]
+    assert context.get("intent") == "research"
+    assert context.get("tool_name") == "list_directory"
+    assert context.get("tool_ok") is True
+    assert context.get("tool_result", {}).get("entries") == ["alpha.txt"]
+    assert context["workflow_execution_order"] == [
+        "router",
+        "context_builder",
+        "tool_call",
+        "llm_worker",
+        "validator",
+    ]
+    assert "search_web" not in context["workflow_execution_order"]
+
+
+def test_controller_explicit_tool_call_still_uses_tool_call_node(tool_root: Path, tmp_path: Path) -> None:
+    service = ControllerService(
+        memory_manager=build_memory(tmp_path),
+        hardware_service=StubHardwareService(),
+        model_registry=StubModelRegistry(),
+    )
+
+    result = service.run(
+        user_input="research local files",
+        tool_call={
+            "tool_name": "list_directory",
+            "payload": {"path": str(tool_root)},
+            "allow_write_safe": False,
+            "sandbox_roots": [str(tool_root)],
+        },
+    )
 
-        assert result["final_state"] in {"ARCHIVE", "FAILED"}
-        context = result["context"]
-        assert context.get("intent") == "research"
-        assert context.get("tool_name") == "list_directory"
-        assert context.get("tool_ok") is True
-        assert context.get("tool_result", {}).get("entries") == ["alpha.txt"]
-        assert context["workflow_execution_order"] == [
-            "router",
-            "context_builder",
-            "tool_call",
-            "llm_worker",
-            "validator",
-        ]
-        assert "search_web" not in context["workflow_execution_order"]
-
-
-def test_controller_service_research_same_input_same_graph_deterministic() -> None:
+    assert result["final_state"] in {"ARCHIVE", "FAILED"}
+    context = result["context"]
+    assert context.get("intent") == "research"
+    assert context.get("tool_name") == "list_directory"
+    assert context.get("tool_ok") is True
+    assert context.get("tool_result", {}).get("entries") == ["alpha.txt"]
+    assert context["workflow_execution_order"] == [
+        "router",
+        "context_builder",
+        "tool_call",
+        "llm_worker",
+        "validator",
+    ]
+    assert "search_web" not in context["workflow_execution_order"]
+
+
+def test_controller_service_research_same_input_same_graph_deterministic(tmp_path: Path) -> None:
     from backend.workflow.nodes.search_web_node import SearchWebNode
 
     original_execute = SearchWebNode.execute
@@ -1473,202 +1496,158 @@ def test_controller_service_research_same_input_same_graph_deterministic() -> No
         return context
 
     SearchWebNode.execute = _stub_execute  # type: ignore[method-assign]
-    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
-        service = ControllerService(
-            memory_manager=build_memory(tmp_dir),
-            hardware_service=StubHardwareService(),
-            model_registry=StubModelRegistry(),
-        )
-
-        try:
-            result_a = service.run(user_input="research deterministic graph")
-            result_b = service.run(user_input="research deterministic graph")
-        finally:
-            SearchWebNode.execute = original_execute  # type: ignore[method-assign]
-
-        context_a = result_a["context"]
-        context_b = result_b["context"]
-        assert context_a["workflow_execution_order"] == context_b["workflow_execution_order"]
-        assert context_a["workflow_graph"] == context_b["workflow_graph"]
+    service = ControllerService(
+        memory_manager=build_memory(tmp_path),
+        hardware_service=StubHardwareService(),
+        model_registry=StubModelRegistry(),
+    )
 
+    try:
+        result_a = service.run(user_input="research deterministic graph")
+        result_b = service.run(user_input="research deterministic graph")
+    finally:
+        SearchWebNode.execute = original_execute  # type: ignore[method-assign]
 
-def test_controller_service_run_tool_call_write_safe_denied_by_default() -> None:
-    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
-        root = Path(tmp_dir) / "tool-root"
-        root.mkdir(parents=True, exist_ok=True)
+    context_a = result_a["context"]
+    context_b = result_b["context"]
+    assert context_a["workflow_execution_order"] == context_b["workflow_execution_order"]
+    assert context_a["workflow_graph"] == context_b["workflow_graph"]
 
-        service = ControllerService(
-            memory_manager=build_memory(tmp_dir),
-            hardware_service=StubHardwareService(),
-            model_registry=StubModelRegistry(),
-        )
 
-        target = root / "blocked.txt"
-        result = service.run(
-            user_input="attempt write",
-            tool_call={
-                "tool_name": "write_file",
-                "payload": {
-                    "path": str(target),
-                    "content": "blocked",
-                    "encoding": "utf-8",
-                },
-                "allow_write_safe": False,
-                "sandbox_roots": [str(root)],
+def test_controller_service_run_tool_call_write_safe_denied_by_default(
+    tool_service: ControllerService, tool_root: Path
+) -> None:
+    target = tool_root / f"blocked-{uuid4().hex}.txt"
+    result = tool_service.run(
+        user_input="attempt write",
+        tool_call={
+            "tool_name": "write_file",
+            "payload": {
+                "path": str(target),
+                "content": "blocked",
+                "encoding": "utf-8",
             },
-        )
-
-        assert result["final_state"] in {"ARCHIVE", "FAILED"}
-        context = result["context"]
-        assert context["tool_ok"] is False
-        assert context["tool_result"]["code"] == "permission_denied"
-        assert not target.exists()
-
+            "allow_write_safe": False,
+            "sandbox_roots": [str(tool_root)],
+        },
+    )
 
-def test_tool_call_node_uses_custom_audit_log_path_and_whitespace_falls_back(monkeypatch) -> None:
-    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
-        root = Path(tmp_dir) / "tool-root"
-        root.mkdir(parents=True, exist_ok=True)
+    assert result["final_state"] in {"ARCHIVE", "FAILED"}
+    context = result["context"]
+    assert context["tool_ok"] is False
+    assert context["tool_result"]["code"] == "permission_denied"
+    assert not target.exists()
 
-        service = ControllerService(
-            memory_manager=build_memory(tmp_dir),
-            hardware_service=StubHardwareService(),
-            model_registry=StubModelRegistry(),
-        )
-
-        custom_log_path = Path(tmp_dir) / "custom_security_audit.jsonl"
-        fallback_log_path = Path(tmp_dir) / "fallback_security_audit.jsonl"
-
-        def _patched_default_logger() -> SecurityAuditLogger:
-            return SecurityAuditLogger(fallback_log_path)
-
-        monkeypatch.setattr(audit_logger_module, "create_default_audit_logger", _patched_default_logger)
-
-        custom_result = service.run(
-            user_input="external deny custom",
-            tool_call={
-                "tool_name": "list_directory",
-                "payload": {"path": str(root)},
-                "allow_write_safe": False,
-                "sandbox_roots": [str(root)],
-                "external_call": True,
-                "allow_external": False,
-                "external_provider": "provider-custom",
-                "external_endpoint": "/custom",
-                "audit_log_path": str(custom_log_path),
-            },
-        )
-        assert custom_result["context"]["tool_result"]["code"] == "permission_denied"
-        assert custom_log_path.exists()
-        custom_events = [json.loads(line) for line in custom_log_path.read_text(encoding="utf-8").splitlines()]
-        assert any(event["event_type"] == "permission_denied" for event in custom_events)
-
-        fallback_result = service.run(
-            user_input="external deny fallback",
-            tool_call={
-                "tool_name": "list_directory",
-                "payload": {"path": str(root)},
-                "allow_write_safe": False,
-                "sandbox_roots": [str(root)],
-                "external_call": True,
-                "allow_external": False,
-                "external_provider": "provider-fallback",
-                "external_endpoint": "/fallback",
-                "audit_log_path": "   ",
-            },
-        )
-        assert fallback_result["context"]["tool_result"]["code"] == "permission_denied"
-        assert fallback_log_path.exists()
-        fallback_events = [json.loads(line) for line in fallback_log_path.read_text(encoding="utf-8").splitlines()]
-        assert any(event["event_type"] == "permission_denied" for event in fallback_events)
 
+def test_tool_call_node_uses_custom_audit_log_path_and_whitespace_falls_back(
+    tool_service: ControllerService, default_audit_path: dict[str, Path | None], tool_root: Path, tmp_path: Path
+) -> None:
+    custom_log_path = tmp_path / "custom_security_audit.jsonl"
+    fallback_log_path = tmp_path / "fallback_security_audit.jsonl"
+    default_audit_path["path"] = fallback_log_path
+
+    custom_result = tool_service.run(
+        user_input="external deny custom",
+        tool_call={
+            "tool_name": "list_directory",
+            "payload": {"path": str(tool_root)},
+            "allow_write_safe": False,
+            "sandbox_roots": [str(tool_root)],
+            "external_call": True,
+            "allow_external": False,
+            "external_provider": "provider-custom",
+            "external_endpoint": "/custom",
+            "audit_log_path": str(custom_log_path),
+        },
+    )
+    assert custom_result["context"]["tool_result"]["code"] == "permission_denied"
+    assert custom_log_path.exists()
+    assert audit_log_contains(custom_log_path, "permission_denied")
+
+    fallback_result = tool_service.run(
+        user_input="external deny fallback",
+        tool_call={
+            "tool_name": "list_directory",
+            "payload": {"path": str(tool_root)},
+            "allow_write_safe": False,
+            "sandbox_roots": [str(tool_root)],
+            "external_call": True,
+            "allow_external": False,
+            "external_provider": "provider-fallback",
+            "external_endpoint": "/fallback",
+            "audit_log_path": "   ",
+        },
+    )
+    assert fallback_result["context"]["tool_result"]["code"] == "permission_denied"
+    assert fallback_log_path.exists()
+    assert audit_log_contains(fallback_log_path, "permission_denied")
 
-def test_tool_call_node_default_audit_logger_behavior_unchanged_without_override(monkeypatch) -> None:
-    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
-        root = Path(tmp_dir) / "tool-root"
-        root.mkdir(parents=True, exist_ok=True)
 
-        service = ControllerService(
-            memory_manager=build_memory(tmp_dir),
-            hardware_service=StubHardwareService(),
-            model_registry=StubModelRegistry(),
-        )
+def test_tool_call_node_default_audit_logger_behavior_unchanged_without_override(
+    tool_service: ControllerService, default_audit_path: dict[str, Path | None], tool_root: Path, tmp_path: Path
+) -> None:
+    patched_default_path = tmp_path / "security_audit.jsonl"
+    default_audit_path["path"] = patched_default_path
+
+    result = tool_service.run(
+        user_input="external deny default",
+        tool_call={
+            "tool_name": "list_directory",
+            "payload": {"path": str(tool_root)},
+            "allow_write_safe": False,
+            "sandbox_roots": [str(tool_root)],
+            "external_call": True,
+            "allow_external": False,
+            "external_provider": "provider-default",
+            "external_endpoint": "/default",
+        },
+    )
 
-        patched_default_path = Path(tmp_dir) / "security_audit.jsonl"
+    assert result["final_state"] in {"ARCHIVE", "FAILED"}
+    assert result["context"]["tool_ok"] is False
+    assert result["context"]["tool_result"]["code"] == "permission_denied"
+    assert patched_default_path.exists()
+    assert audit_log_contains(patched_default_path, "permission_denied")
 
-        def _patched_default_logger() -> SecurityAuditLogger:
-            return SecurityAuditLogger(patched_default_path)
 
-        monkeypatch.setattr(audit_logger_module, "create_default_audit_logger", _patched_default_logger)
+def test_tool_call_node_attaches_redacted_output_and_logs_pii_events_to_override_path(
+    tool_service: ControllerService, tmp_path: Path
+) -> None:
+    root = tmp_path / "tool-root"
+    root.mkdir(parents=True, exist_ok=True)
+    target = root / "secret.txt"
+    target.write_text("contact me at test@example.com", encoding="utf-8")
+    audit_log_path = tmp_path / "tool_audit.jsonl"
+
+    result = tool_service.run(
+        user_input="read file",
+        tool_call={
+            "tool_name": "read_file",
+            "payload": {"path": str(target), "encoding": "utf-8"},
+            "allow_write_safe": False,
+            "sandbox_roots": [str(root)],
+            "external_call": False,
+            "redaction_mode": "strict",
+            "audit_log_path": str(audit_log_path),
+        },
+    )
 
-        result = service.run(
-            user_input="external deny default",
-            tool_call={
-                "tool_name": "list_directory",
-                "payload": {"path": str(root)},
-                "allow_write_safe": False,
-                "sandbox_roots": [str(root)],
-                "external_call": True,
-                "allow_external": False,
-                "external_provider": "provider-default",
-                "external_endpoint": "/default",
-            },
-        )
+    assert result["final_state"] in {"ARCHIVE", "FAILED"}
+    tool_result = result["context"]["tool_result"]
+    assert result["context"]["tool_ok"] is True
+    assert tool_result["code"] == "ok"
+    assert tool_result["content"] == "contact me at test@example.com"
+    assert "privacy" in tool_result
+    assert "redacted_result_text" in tool_result
+    assert tool_result["privacy"]["pii_detected"] is True
+    assert tool_result["privacy"]["pii_redacted"] is True
+    assert "[EMAIL_REDACTED]" in tool_result["redacted_result_text"]
 
-        assert result["final_state"] in {"ARCHIVE", "FAILED"}
-        assert result["context"]["tool_ok"] is False
-        assert result["context"]["tool_result"]["code"] == "permission_denied"
-        assert patched_default_path.exists()
-        events = [json.loads(line) for line in patched_default_path.read_text(encoding="utf-8").splitlines()]
-        assert any(event["event_type"] == "permission_denied" for event in events)
-
-
-def test_tool_call_node_attaches_redacted_output_and_logs_pii_events_to_override_path() -> None:
-    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
-        root = Path(tmp_dir) / "tool-root"
-        root.mkdir(parents=True, exist_ok=True)
-        target = root / "secret.txt"
-        target.write_text("contact me at test@example.com", encoding="utf-8")
-        audit_log_path = Path(tmp_dir) / "tool_audit.jsonl"
-
-        service = ControllerService(
-            memory_manager=build_memory(tmp_dir),
-            hardware_service=StubHardwareService(),
-            model_registry=StubModelRegistry(),
-        )
+    assert audit_log_path.exists()
+    assert audit_log_contains(audit_log_path, "pii_detected", "pii_redacted")
 
-        result = service.run(
-            user_input="read file",
-            tool_call={
-                "tool_name": "read_file",
-                "payload": {"path": str(target), "encoding": "utf-8"},
-                "allow_write_safe": False,
-                "sandbox_roots": [str(root)],
-                "external_call": False,
-                "redaction_mode": "strict",
-                "audit_log_path": str(audit_log_path),
-            },
-        )
 
-        assert result["final_state"] in {"ARCHIVE", "FAILED"}
-        tool_result = result["context"]["tool_result"]
-        assert result["context"]["tool_ok"] is True
-        assert tool_result["code"] == "ok"
-        assert tool_result["content"] == "contact me at test@example.com"
-        assert "privacy" in tool_result
-        assert "redacted_result_text" in tool_result
-        assert tool_result["privacy"]["pii_detected"] is True
-        assert tool_result["privacy"]["pii_redacted"] is True
-        assert "[EMAIL_REDACTED]" in tool_result["redacted_result_text"]
-
-        assert audit_log_path.exists()
-        events = [json.loads(line) for line in audit_log_path.read_text(encoding="utf-8").splitlines()]
-        event_types = {event["event_type"] for event in events}
-        assert "pii_detected" in event_types
-        assert "pii_redacted" in event_types
-
-
-def test_controller_query_redaction_enabled_redacts_model_bound_prompt_message_path(monkeypatch) -> None:
+def test_controller_query_redaction_enabled_redacts_model_bound_prompt_message_path(monkeypatch, tmp_path: Path) -> None:
     class _Settings:
         REDACT_PII_QUERIES = True
         MODEL_PATH = "models/"
@@ -1691,15 +1670,14 @@ def test_controller_query_redaction_enabled_redacts_model_bound_prompt_message_p
     monkeypatch.setattr(controller_service_module, "Settings", lambda: _Settings)
     monkeypatch.setitem(sys.modules, "llama_cpp", types.SimpleNamespace(Llama=_StubLlama))
 
-    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
-        service = ControllerService(
-            memory_manager=build_memory(tmp_dir),
-            hardware_service=StubHardwareService(),
-            model_registry=PresentModelRegistry(),
-        )
+    service = ControllerService(
+        memory_manager=build_memory(tmp_path),
+        hardware_service=StubHardwareService(),
+        model_registry=PresentModelRegistry(),
+    )
 
-        raw_input = "Email me at test@example.com"
-        result = service.run(user_input=raw_input)
+    raw_input = "Email me at test@example.com"
+    result = service.run(user_input=raw_input)
 
     prompt = str(captured.get("prompt", ""))
     assert "User: Email me at test@example.com" not in prompt
@@ -1708,7 +1686,7 @@ def test_controller_query_redaction_enabled_redacts_model_bound_prompt_message_p
     assert result["context"].get("redact_pii_queries") is True
 
 
-def test_controller_query_redaction_disabled_preserves_model_bound_prompt_message_path(monkeypatch) -> None:
+def test_controller_query_redaction_disabled_preserves_model_bound_prompt_message_path(monkeypatch, tmp_path: Path) -> None:
     class _Settings:
         REDACT_PII_QUERIES = False
         MODEL_PATH = "models/"
@@ -1731,15 +1709,14 @@ def test_controller_query_redaction_disabled_preserves_model_bound_prompt_messag
     monkeypatch.setattr(controller_service_module, "Settings", lambda: _Settings)
     monkeypatch.setitem(sys.modules, "llama_cpp", types.SimpleNamespace(Llama=_StubLlama))
 
-    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
-        service = ControllerService(
-            memory_manager=build_memory(tmp_dir),
-            hardware_service=StubHardwareService(),
-            model_registry=PresentModelRegistry(),
-        )
+    service = ControllerService(
+        memory_manager=build_memory(tmp_path),
+        hardware_service=StubHardwareService(),
+        model_registry=PresentModelRegistry(),
+    )
 
-        raw_input = "Email me at test@example.com"
-        result = service.run(user_input=raw_input)
+    raw_input = "Email me at test@example.com"
+    result = service.run(user_input=raw_input)
 
     prompt = str(captured.get("prompt", ""))
     assert "User: Email me at test@example.com" in prompt
@@ -1750,6 +1727,7 @@ def test_controller_query_redaction_disabled_preserves_model_bound_prompt_messag
 
 def test_controller_combined_query_and_result_redaction_path_redacts_prompt_persistence_and_semantic_write(
     monkeypatch,
+    tmp_path: Path,
 ) -> None:
     class _Settings:
         REDACT_PII_QUERIES = True
@@ -1775,39 +1753,38 @@ def test_controller_combined_query_and_result_redaction_path_redacts_prompt_pers
     monkeypatch.setattr(controller_service_module, "Settings", lambda: _Settings)
     monkeypatch.setitem(sys.modules, "llama_cpp", types.SimpleNamespace(Llama=_StubLlama))
 
-    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
-        memory = build_recording_memory(tmp_dir)
-        service = ControllerService(
-            memory_manager=memory,
-            hardware_service=StubHardwareService(),
-            model_registry=PresentModelRegistry(),
-        )
+    memory = build_recording_memory(tmp_path)
+    service = ControllerService(
+        memory_manager=memory,
+        hardware_service=StubHardwareService(),
+        model_registry=PresentModelRegistry(),
+    )
 
-        raw_input = "My email is test@example.com"
-        result = service.run(user_input=raw_input)
+    raw_input = "My email is test@example.com"
+    result = service.run(user_input=raw_input)
 
-        assert result["final_state"] == "ARCHIVE"
+    assert result["final_state"] == "ARCHIVE"
 
-        prompt = str(captured.get("prompt", ""))
-        assert "User: My email is test@example.com" not in prompt
-        assert "[EMAIL_REDACTED]" in prompt
+    prompt = str(captured.get("prompt", ""))
+    assert "User: My email is test@example.com" not in prompt
+    assert "[EMAIL_REDACTED]" in prompt
 
-        task_state = memory.get_task_state(result["task_id"])
-        assert isinstance(task_state, dict)
-        messages = task_state.get("messages", [])
-        assistant_messages = [m for m in messages if m.get("role") == "assistant"]
-        assert assistant_messages
-        persisted_assistant = str(assistant_messages[-1].get("content", ""))
-        assert "test@example.com" not in persisted_assistant
-        assert "[EMAIL_REDACTED]" in persisted_assistant
+    task_state = memory.get_task_state(result["task_id"])
+    assert isinstance(task_state, dict)
+    messages = task_state.get("messages", [])
+    assistant_messages = [m for m in messages if m.get("role") == "assistant"]
+    assert assistant_messages
+    persisted_assistant = str(assistant_messages[-1].get("content", ""))
+    assert "test@example.com" not in persisted_assistant
+    assert "[EMAIL_REDACTED]" in persisted_assistant
 
-        assert len(memory.semantic_writes) == 1
-        semantic_text = str(memory.semantic_writes[0].get("text", ""))
-        assert "test@example.com" not in semantic_text
-        assert "[EMAIL_REDACTED]" in semantic_text
+    assert len(memory.semantic_writes) == 1
+    semantic_text = str(memory.semantic_writes[0].get("text", ""))
+    assert "test@example.com" not in semantic_text
+    assert "[EMAIL_REDACTED]" in semantic_text
 
 
-def test_controller_wires_retrieval_settings_into_context_builder_retrieval_config(monkeypatch) -> None:
+def test_controller_wires_retrieval_settings_into_context_builder_retrieval_config(monkeypatch, tmp_path: Path) -> None:
     captured: dict[str, object] = {}
 
     class _Settings:
@@ -1849,14 +1826,13 @@ def test_controller_wires_retrieval_settings_into_context_builder_retrieval_conf
     monkeypatch.setattr(controller_service_module, "LLMWorkerNode", _LLMWorkerStub)
     monkeypatch.setattr(controller_service_module, "ValidatorNode", _ValidatorStub)
 
-    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
-        service = ControllerService(
-            memory_manager=build_memory(tmp_dir),
-            hardware_service=StubHardwareService(),
-            model_registry=PresentModelRegistry(),
-        )
+    service = ControllerService(
+        memory_manager=build_memory(tmp_path),
+        hardware_service=StubHardwareService(),
+        model_registry=PresentModelRegistry(),
+    )
 
-        result = service.run(user_input="hello")
+    result = service.run(user_input="hello")
 
     assert result["final_state"] == "ARCHIVE"
     retrieval_config = captured.get("retrieval_config")
@@ -1866,20 +1842,19 @@ def test_controller_wires_retrieval_settings_into_context_builder_retrieval_conf
     assert getattr(retrieval_config, "time_decay_tau_hours") == 36.0
 
 
-def test_controller_transcribe_uses_stt_model_selection_and_provider(monkeypatch) -> None:
+def test_controller_transcribe_uses_stt_model_selection_and_provider(monkeypatch, tmp_path: Path) -> None:
     monkeypatch.setattr(
         "backend.voice.stt_provider.FasterWhisperSTTProvider.transcribe_file",
         lambda self, audio_path: f"transcript::{audio_path}",
     )
 
-    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
-        service = ControllerService(
-            memory_manager=build_memory(tmp_dir),
-            hardware_service=StubHardwareService(),
-            model_registry=StubSTTModelRegistry(),
-        )
+    service = ControllerService(
+        memory_manager=build_memory(tmp_path),
+        hardware_service=StubHardwareService(),
+        model_registry=StubSTTModelRegistry(),
+    )
 
-        result = service.transcribe("tests/fixtures/sample.wav")
+    result = service.transcribe("tests/fixtures/sample.wav")
 
     assert result["transcript"] == "transcript::tests/fixtures/sample.wav"
     assert result["model_id"] == "whisper-base"
@@ -1887,21 +1862,20 @@ def test_controller_transcribe_uses_stt_model_selection_and_provider(monkeypatch
     assert result["hardware"] == "CPU_ONLY"
 
 
-def test_controller_speak_uses_tts_model_selection_and_provider(monkeypatch) -> None:
+def test_controller_speak_uses_tts_model_selection_and_provider(monkeypatch, tmp_path: Path) -> None:
     monkeypatch.setattr(
         "backend.voice.tts_provider.PiperTTSProvider.synthesize_to_file",
         lambda self, text, output_path: f"{output_path}::{text}",
     )
 
-    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
-        monkeypatch.setenv("DATA_PATH", str(Path(tmp_dir)))
-        service = ControllerService(
-            memory_manager=build_memory(tmp_dir),
-            hardware_service=StubHardwareService(),
-            model_registry=StubTTSModelRegistry(),
-        )
+    monkeypatch.setenv("DATA_PATH", str(tmp_path))
+    service = ControllerService(
+        memory_manager=build_memory(tmp_path),
+        hardware_service=StubHardwareService(),
+        model_registry=StubTTSModelRegistry(),
+    )
 
-        result = service.speak("hello tts")
+    result = service.speak("hello tts")
 
     assert result["audio_path"].endswith("::hello tts")
     assert result["model_id"] == "piper-tts"
@@ -1909,17 +1883,16 @@ def test_controller_speak_uses_tts_model_selection_and_provider(monkeypatch) ->
     assert result["hardware"] == "CPU_ONLY"
 
 
-def test_controller_speak_fail_closed_when_tts_config_missing(monkeypatch) -> None:
-    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
-        monkeypatch.setenv("DATA_PATH", str(Path(tmp_dir)))
-        service = ControllerService(
-            memory_manager=build_memory(tmp_dir),
-            hardware_service=StubHardwareService(),
-            model_registry=StubTTSMissingConfigRegistry(),
-        )
+def test_controller_speak_fail_closed_when_tts_config_missing(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("DATA_PATH", str(tmp_path))
+    service = ControllerService(
+        memory_manager=build_memory(tmp_path),
+        hardware_service=StubHardwareService(),
+        model_registry=StubTTSMissingConfigRegistry(),
+    )
 
-        try:
-            service.speak("hello tts")
-            assert False, "expected RuntimeError"
-        except RuntimeError as exc:
-            assert str(exc) == "tts_config_not_available"
+    try:
+        service.speak("hello tts")
+        assert False, "expected RuntimeError"
+    except RuntimeError as exc:
+        assert str(exc) == "tts_config_not_available"
@@ -9,7 +9,7 @@ from backend.models.model_registry import ModelRegistry
 
 class TestEmbeddingFunction:
     def encode(self, text: str) -> list[float]:
-        base = float((sum(ord(ch) for ch in text) % 13) + 1)
+        base = float((sum(text.encode("utf-8")) % 13) + 1)
         return [base] * 384
 
 
@@ -25,6 +25,13 @@ def build_memory(tmp_dir: str) -> MemoryManager:
 
 
 class StubHardwareService(HardwareService):
+    def __init__(self) -> None:
+        # Answers are fixed, so skip the psutil/GPU probe HardwareService runs on construction
+        self._cpu_info = {}
+        self._gpu_info = []
+        self._memory_info = {}
+        self._accel_providers = []
+
     def detect_hardware_type(self) -> HardwareType:
         return HardwareType.CPU_ONLY
 
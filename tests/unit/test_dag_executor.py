@@ -8,9 +8,7 @@ class _Node:
         self.name = name
 
     def execute(self, context: dict) -> dict:
-        trail = list(context.get("trail", []))
-        trail.append(self.name)
-        context["trail"] = trail
+        context.setdefault("trail", []).append(self.name)
         return context
 
 
@@ -71,3 +69,18 @@ def test_dag_executor_fails_closed_on_cycle() -> None:
 
     with pytest.raises(WorkflowGraphError, match="contains a cycle"):
         DAGExecutor().resolve_execution_order(graph, registry)
+
+
+def test_dag_executor_order_is_memoized_per_graph() -> None:
+    graph = WorkflowGraph(
+        nodes=("router", "llm_worker"),
+        edges=(WorkflowEdge("router", "llm_worker"),),
+        entry="router",
+    )
+    executor = DAGExecutor()
+
+    first = executor.topological_order(graph)
+    first.append("mutated")
+    second = executor.topological_order(graph)
+
+    assert second == ["router", "llm_worker"]
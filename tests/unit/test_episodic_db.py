@@ -1,8 +1,11 @@
 import sqlite3
 import tempfile
+import threading
 from contextlib import closing
 from pathlib import Path
 
+import pytest
+
 from backend.memory.episodic_db import EpisodicMemory
 
 
@@ -97,3 +100,100 @@ def test_log_validation_inserts_record() -> None:
             ).fetchone()
 
     assert row == (decision_id, "schema", "Pass", "validated")
+
+
+def test_log_decisions_inserts_batch_in_order() -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = Path(tmp_dir) / "trace.db"
+        memory = EpisodicMemory(db_path=str(db_path))
+
+        inserted = memory.log_decisions(
+            [
+                ("2026-02-24T12:00:00", "task-1", "dag_node_event", '{"n": 1}', "node_start"),
+                ("2026-02-24T12:00:01", "task-1", "dag_node_event", '{"n": 1}', "node_end"),
+            ]
+        )
+        assert memory.log_decisions([]) == 0
+
+        with closing(sqlite3.connect(db_path)) as conn:
+            rows = conn.execute(
+                "SELECT timestamp, task_id, action_type, content, status FROM decisions ORDER BY id"
+            ).fetchall()
+
+    assert inserted == 2
+    assert rows == [
+        ("2026-02-24T12:00:00", "task-1", "dag_node_event", '{"n": 1}', "node_start"),
+        ("2026-02-24T12:00:01", "task-1", "dag_node_event", '{"n": 1}', "node_end"),
+    ]
+
+
+def test_pragmas_are_applied_and_validated() -> None:
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp_dir:
+        db_path = Path(tmp_dir) / "trace.db"
+        memory = EpisodicMemory(db_path=str(db_path), pragmas={"journal_mode": "WAL", "synchronous": "NORMAL"})
+
+        with closing(memory._connect()) as conn:
+            journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+            synchronous = conn.execute("PRAGMA synchronous").fetchone()[0]
+
+    assert journal_mode == "wal"
+    assert synchronous == 1
+
+    with pytest.raises(ValueError):
+        EpisodicMemory(db_path=":memory:", pragmas={"journal_mode": "WAL; DROP TABLE decisions"})
+
+
+def test_shared_memory_uri_persists_across_connections() -> None:
+    memory = EpisodicMemory(db_path="file:episodic-test-shared?mode=memory&cache=shared")
+
+    decision_id = memory.log_decision("task-1", "plan", "in memory", "pending")
+
+    with closing(memory.connect()) as conn:
+        row = conn.execute("SELECT content FROM decisions WHERE id = ?", (decision_id,)).fetchone()
+
+    assert row == ("in memory",)
+
+
+def test_batch_commits_writes_together_and_rolls_back_on_error() -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = Path(tmp_dir) / "trace.db"
+        memory = EpisodicMemory(db_path=str(db_path))
+
+        with memory.batch():
+            decision_id = memory.log_decision("task-1", "tool_call", "run tool", "completed")
+            memory.log_tool_calls(
+                [
+                    (decision_id, "list_directory", '{"path": "."}', '{"ok": true}', "2026-02-24T12:00:00"),
+                    (decision_id, "read_file", '{"path": "a"}', '{"ok": true}', "2026-02-24T12:00:01"),
+                ]
+            )
+            with closing(sqlite3.connect(db_path)) as conn:
+                uncommitted = conn.execute("SELECT COUNT(*) FROM decisions").fetchone()[0]
+
+        with pytest.raises(RuntimeError):
+            with memory.batch():
+                memory.log_decision("task-2", "plan", "discarded", "pending")
+                raise RuntimeError("abort batch")
+
+        with closing(sqlite3.connect(db_path)) as conn:
+            decisions = conn.execute("SELECT task_id FROM decisions").fetchall()
+            tool_names = conn.execute("SELECT tool_name FROM tool_calls ORDER BY id").fetchall()
+
+    assert uncommitted == 0
+    assert decisions == [("task-1",)]
+    assert tool_names == [("list_directory",), ("read_file",)]
+
+
+def test_shared_connection_serves_other_threads_until_closed() -> None:
+    memory = EpisodicMemory(db_path="file:episodic-test-threads?mode=memory&cache=shared")
+
+    worker = threading.Thread(target=memory.log_decision, args=("task-1", "plan", "from worker", "pending"))
+    worker.start()
+    worker.join()
+
+    assert [row["content"] for row in memory.search_decisions("worker")] == ["from worker"]
+
+    memory.close()
+    memory.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        memory.search_decisions("worker")
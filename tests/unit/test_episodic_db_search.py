@@ -25,6 +25,7 @@ def test_index_creation_is_idempotent(tmp_path: Path) -> None:
     assert "idx_decisions_task_id" in names
     assert "idx_decisions_action_type" in names
     assert "idx_decisions_id_desc" in names
+    assert "idx_decisions_task_action_id" in names
     assert "idx_tool_calls_decision_id" in names
     assert "idx_tool_calls_tool_name" in names
     assert "idx_tool_calls_id_desc" in names
@@ -105,3 +106,33 @@ def test_search_rejects_empty_query_for_both_methods(tmp_path: Path) -> None:
 
     with pytest.raises(ValueError):
         memory.search_tool_calls("")
+
+
+def test_search_matches_substrings_and_backfills_existing_rows(tmp_path: Path) -> None:
+    db_path = tmp_path / "trace.db"
+    memory = EpisodicMemory(db_path=str(db_path))
+    early_id = memory.log_decision("task-a", "plan", "the ALPHABET soup", "queued")
+
+    # Simulate a trace database created before the search index existed
+    with closing(sqlite3.connect(db_path)) as conn:
+        conn.executescript(
+            "DROP TABLE decisions_fts; DROP TABLE tool_calls_fts;"
+            "DROP TRIGGER decisions_fts_ai; DROP TRIGGER decisions_fts_ad; DROP TRIGGER decisions_fts_au;"
+            "DROP TRIGGER tool_calls_fts_ai; DROP TRIGGER tool_calls_fts_ad; DROP TRIGGER tool_calls_fts_au;"
+        )
+
+    memory = EpisodicMemory(db_path=str(db_path))
+    late_id = memory.log_decision("task-a", "plan", "alpha_2", "queued")
+
+    assert [row["id"] for row in memory.search_decisions("alpha")] == [late_id, early_id]
+    # Short queries and LIKE wildcards keep the scan semantics
+    assert [row["id"] for row in memory.search_decisions("al")] == [late_id, early_id]
+    assert [row["id"] for row in memory.search_decisions("a_2")] == [late_id]
+    # LIKE only folds ASCII case; the indexed path must not widen that for longer queries
+    accented_id = memory.log_decision("task-a", "plan", "ÉTÉ CAFÉ", "queued")
+    assert memory.search_decisions("été café") == []
+    assert memory.search_decisions("été") == []
+    assert [row["id"] for row in memory.search_decisions("ÉTÉ caf")] == [accented_id]
+    memory.log_tool_call(accented_id, "lookup", "{\"q\": \"CAFÉ\"}", "ok")
+    assert memory.search_tool_calls("café") == []
+    assert len(memory.search_tool_calls("CAFÉ")) == 1
@@ -185,6 +185,22 @@ def test_write_file_enforces_encoded_byte_limit(tmp_path: Path) -> None:
     assert result["code"] == SandboxErrorCode.WRITE_TOO_LARGE.value
 
 
+def test_write_file_ascii_byte_limit_is_exact(tmp_path: Path) -> None:
+    root = tmp_path / "root"
+    root.mkdir()
+    sandbox = Sandbox(SandboxConfig(allowed_roots=(root,), allow_write=True, max_write_bytes=3))
+
+    ok, result = run_write_file(sandbox, WriteFileInput(path=str(root / "fits.txt"), content="abc"))
+    assert ok is True
+    assert result["size"] == 3
+
+    ok, result = run_write_file(sandbox, WriteFileInput(path=str(root / "over.txt"), content="abcd"))
+    assert ok is False
+    assert result["code"] == SandboxErrorCode.WRITE_TOO_LARGE.value
+    assert result["size"] == 4
+    assert not (root / "over.txt").exists()
+
+
 def test_delete_file_denied_when_allow_delete_false(tmp_path: Path) -> None:
     root = tmp_path / "root"
     root.mkdir()
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+from collections import defaultdict
 from datetime import datetime, timedelta, timezone
+from math import exp
 
 import pytest
 
@@ -17,19 +19,28 @@ class _SemanticStub:
         return list(self.rows[:top_k])
 
 
+def _index_by_task(rows: list[dict]) -> dict[object, list[dict]]:
+    by_task: defaultdict[object, list[dict]] = defaultdict(list)
+    for row in rows:
+        by_task[row.get("task_id")].append(row)
+    return dict(by_task)
+
+
 class _EpisodicStub:
     def __init__(self, decisions: list[dict], tool_calls: list[dict]) -> None:
         self.decisions = decisions
         self.tool_calls = tool_calls
+        self._decisions_by_task = _index_by_task(decisions)
+        self._tool_calls_by_task = _index_by_task(tool_calls)
 
     def search_decisions(self, query: str, *, limit: int = 20, task_id: str | None = None) -> list[dict]:
         del query
-        rows = [row for row in self.decisions if task_id is None or row.get("task_id") == task_id]
+        rows = self.decisions if task_id is None else self._decisions_by_task.get(task_id, [])
         return rows[:limit]
 
     def search_tool_calls(self, query: str, *, limit: int = 20, task_id: str | None = None) -> list[dict]:
         del query
-        rows = [row for row in self.tool_calls if task_id is None or row.get("task_id") == task_id]
+        rows = self.tool_calls if task_id is None else self._tool_calls_by_task.get(task_id, [])
         return rows[:limit]
 
 
@@ -189,3 +200,78 @@ def test_hybrid_retriever_rejects_empty_query() -> None:
             config=RetrievalConfig(),
             limit=5,
         )
+
+
+def test_hybrid_retriever_breaks_full_ties_by_stable_id_then_content() -> None:
+    timestamp = "2026-03-01T11:00:00"
+    episodic = _EpisodicStub(
+        decisions=[
+            {"id": 2, "timestamp": timestamp, "task_id": "task-1", "content": "zeta", "status": "done"},
+            {"id": 1, "timestamp": timestamp, "task_id": "task-1", "content": "omega", "status": "done"},
+        ],
+        tool_calls=[
+            {
+                "id": 1,
+                "decision_id": 1,
+                "tool_name": "alpha",
+                "params": "",
+                "result": "",
+                "timestamp": timestamp,
+                "task_id": "task-1",
+            },
+        ],
+    )
+
+    retriever = HybridRetriever(
+        semantic_store=_SemanticStub([]),
+        episodic_memory=episodic,
+        working_state_provider=lambda _task_id: None,
+        now_provider=lambda: datetime(2026, 3, 1, 12, 0, 0, tzinfo=timezone.utc),
+    )
+
+    config = RetrievalConfig(
+        relevance_weight=0.0,
+        recency_weight=1.0,
+        max_results=2,
+    )
+
+    results = retriever.retrieve("decision", task_id="task-1", turn=1, config=config, limit=10)
+
+    assert [item.content for item in results] == ["alpha", "omega"]
+    assert all(item.final_score == item.recency_score for item in results)
+
+
+def test_hybrid_retriever_recency_handles_mixed_timestamp_formats() -> None:
+    fixed_now = datetime(2026, 3, 1, 12, 0, 0, tzinfo=timezone.utc)
+    one_hour_ago = fixed_now - timedelta(hours=1)
+    timestamps = {
+        "naive": one_hour_ago.replace(tzinfo=None).isoformat(),
+        "zulu": one_hour_ago.replace(tzinfo=None).isoformat() + "Z",
+        "offset": one_hour_ago.astimezone(timezone(timedelta(hours=5))).isoformat(),
+        "invalid-date": "2026-02-30T11:00:00",
+        "garbage": "yesterday",
+    }
+    episodic = _EpisodicStub(
+        decisions=[
+            {"id": idx, "timestamp": value, "task_id": "task-1", "content": name, "status": "done"}
+            for idx, (name, value) in enumerate(timestamps.items())
+        ],
+        tool_calls=[],
+    )
+
+    retriever = HybridRetriever(
+        semantic_store=_SemanticStub([]),
+        episodic_memory=episodic,
+        working_state_provider=lambda _task_id: None,
+        now_provider=lambda: fixed_now,
+    )
+
+    config = RetrievalConfig(episodic_recency_default=0.25)
+    results = retriever.retrieve("decision", task_id="task-1", turn=1, config=config, limit=10)
+    recency = {item.content: item.recency_score for item in results}
+
+    assert recency["naive"] == pytest.approx(exp(-1.0 / 24.0))
+    assert recency["zulu"] == recency["naive"]
+    assert recency["offset"] == pytest.approx(recency["naive"])
+    assert recency["invalid-date"] == 0.25
+    assert recency["garbage"] == 0.25
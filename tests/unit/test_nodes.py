@@ -19,7 +19,7 @@ TEST_MODEL_PATH = "models/test-model.gguf"
 
 class TestEmbeddingFunction:
     def encode(self, text: str) -> list[float]:
-        base = float((sum(ord(ch) for ch in text) % 13) + 1)
+        base = float((sum(text.encode("utf-8")) % 13) + 1)
         return [base] * 384
 
 
@@ -1,4 +1,5 @@
 import json
+from collections.abc import Iterator
 from pathlib import Path
 
 from backend.security.audit_logger import SecurityAuditLogger, SecurityEventType
@@ -12,6 +13,13 @@ def _make_wrapper(tmp_path: Path) -> tuple[PrivacyExternalCallWrapper, SecurityA
     return wrapper, logger
 
 
+def _iter_audit_events(path: Path) -> Iterator[dict]:
+    with path.open("rb") as handle:
+        for line in handle:
+            if line.strip():
+                yield json.loads(line)
+
+
 def test_deny_by_default_blocks_and_logs_permission_denied(tmp_path: Path) -> None:
     wrapper, logger = _make_wrapper(tmp_path)
     request = ExternalCallRequest(
@@ -131,10 +139,10 @@ def test_audit_log_lines_are_jsonl_with_expected_event_types(tmp_path: Path) ->
 
     wrapper.evaluate_and_prepare_external_call(allow_request)
     wrapper.evaluate_and_prepare_external_call(deny_request)
+    logger.flush()
 
-    lines = logger.log_path.read_text(encoding="utf-8").splitlines()
-    assert len(lines) >= 3
-    events = [json.loads(line) for line in lines]
+    events = list(_iter_audit_events(logger.log_path))
+    assert len(events) >= 3
     event_types = {event["event_type"] for event in events}
     assert "external_call_initiated" in event_types
     assert "permission_denied" in event_types
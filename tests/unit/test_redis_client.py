@@ -1,6 +1,7 @@
 """Unit tests for Redis cache client wrapper (hermetic, no live Redis required)."""
 from __future__ import annotations
 
+import bisect
 from typing import Any
 from types import SimpleNamespace
 
@@ -10,6 +11,7 @@ from backend.cache.redis_client import RedisCacheClient, create_default_redis_cl
 class _FakeRedis:
     def __init__(self) -> None:
         self._store: dict[str, str] = {}
+        self._sorted_keys: list[str] = []
 
     def ping(self) -> bool:
         return True
@@ -18,6 +20,8 @@ class _FakeRedis:
         return self._store.get(key)
 
     def setex(self, key: str, _ttl: int, value: str) -> bool:
+        if key not in self._store:
+            bisect.insort(self._sorted_keys, key)
         self._store[key] = value
         return True
 
@@ -26,6 +30,7 @@ class _FakeRedis:
         for key in keys:
             if key in self._store:
                 del self._store[key]
+                del self._sorted_keys[bisect.bisect_left(self._sorted_keys, key)]
                 deleted += 1
         return deleted
 
@@ -33,13 +38,15 @@ class _FakeRedis:
         # Minimal wildcard support for suffix "*" used by invalidate_pattern tests.
         if match.endswith("*"):
             prefix = match[:-1]
-            for key in list(self._store.keys()):
-                if key.startswith(prefix):
-                    yield key
+            # Keys sharing a prefix are contiguous in sorted order; snapshot the matched run
+            start = bisect.bisect_left(self._sorted_keys, prefix)
+            end = start
+            while end < len(self._sorted_keys) and self._sorted_keys[end].startswith(prefix):
+                end += 1
+            yield from self._sorted_keys[start:end]
             return
-        for key in list(self._store.keys()):
-            if key == match:
-                yield key
+        if match in self._store:
+            yield match
 
 
 def _fake_factory(*_args: Any, **_kwargs: Any) -> _FakeRedis:
@@ -1,3 +1,4 @@
+import bisect
 from pathlib import Path
 from types import SimpleNamespace
 
@@ -21,6 +22,7 @@ class _WriteSafeInput(BaseModel):
 class _FakeRedis:
     def __init__(self) -> None:
         self._store: dict[str, str] = {}
+        self._sorted_keys: list[str] = []
 
     def ping(self) -> bool:
         return True
@@ -29,6 +31,8 @@ class _FakeRedis:
         return self._store.get(key)
 
     def setex(self, key: str, _ttl: int, value: str) -> bool:
+        if key not in self._store:
+            bisect.insort(self._sorted_keys, key)
         self._store[key] = value
         return True
 
@@ -37,19 +41,22 @@ class _FakeRedis:
         for key in keys:
             if key in self._store:
                 del self._store[key]
+                del self._sorted_keys[bisect.bisect_left(self._sorted_keys, key)]
                 deleted += 1
         return deleted
 
     def scan_iter(self, match: str):
         if match.endswith("*"):
             prefix = match[:-1]
-            for key in list(self._store.keys()):
-                if key.startswith(prefix):
-                    yield key
+            # Keys sharing a prefix are contiguous in sorted order; snapshot the matched run
+            start = bisect.bisect_left(self._sorted_keys, prefix)
+            end = start
+            while end < len(self._sorted_keys) and self._sorted_keys[end].startswith(prefix):
+                end += 1
+            yield from self._sorted_keys[start:end]
             return
-        for key in list(self._store.keys()):
-            if key == match:
-                yield key
+        if match in self._store:
+            yield match
 
 
 def _fake_factory(*_args, **_kwargs) -> _FakeRedis:
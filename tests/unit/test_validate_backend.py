@@ -0,0 +1,97 @@
+import importlib.util
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+_SCRIPT_PATH = Path(__file__).resolve().parents[2] / "scripts" / "validate_backend.py"
+
+
+def _load_validator():
+    spec = importlib.util.spec_from_file_location("validate_backend_under_test", _SCRIPT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_inprocess_suite_imports_project_packages_without_rootdir_on_sys_path(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    validator = _load_validator()
+
+    package_dir = tmp_path / "validation_probe_pkg"
+    package_dir.mkdir()
+    (package_dir / "__init__.py").write_text("VALUE = 42\n", encoding="utf-8")
+    suite_dir = tmp_path / "validation_probe_tests"
+    suite_dir.mkdir()
+    (suite_dir / "__init__.py").write_text("", encoding="utf-8")
+    (suite_dir / "test_probe.py").write_text(
+        "from validation_probe_pkg import VALUE\n\n\ndef test_value():\n    assert VALUE == 42\n",
+        encoding="utf-8",
+    )
+
+    # Mirror `python scripts/validate_backend.py`: the project root is not importable up front
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "path", [entry for entry in sys.path if entry not in ("", str(tmp_path))])
+    monkeypatch.setitem(validator.SUITE_EXEC_MODE, "probe", "inproc")
+    monkeypatch.setattr(validator, "_xdist_args", lambda suite_name: [])
+    monkeypatch.setattr(validator, "resolve_python_executable", lambda: sys.executable)
+
+    section = validator.SectionLog()
+    try:
+        status = validator.run_pytest_suite(section, "probe", "validation_probe_tests", tmp_path)
+    finally:
+        for name in [name for name in sys.modules if name.startswith("validation_probe_")]:
+            del sys.modules[name]
+
+    assert status == "PASS", section.lines
+    assert any("PASS: validation_probe_tests.test_probe::test_value" in line for line in section.lines)
+
+
+def test_inprocess_suite_reports_timeout_and_restores_stdout(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    validator = _load_validator()
+
+    suite_dir = tmp_path / "validation_slow_tests"
+    suite_dir.mkdir()
+    (suite_dir / "test_slow.py").write_text(
+        "import time\n\n\ndef test_slow():\n    time.sleep(1.0)\n",
+        encoding="utf-8",
+    )
+    monkeypatch.chdir(tmp_path)
+
+    original_stdout = sys.stdout
+    try:
+        with pytest.raises(validator.subprocess.TimeoutExpired):
+            validator._run_pytest_inprocess(["validation_slow_tests", "-p", "no:cacheprovider"], 0.1)
+        assert sys.stdout is original_stdout
+    finally:
+        for worker in [thread for thread in threading.enumerate() if thread.name == "inproc-pytest"]:
+            worker.join(timeout=10.0)
+        for name in [name for name in sys.modules if name.startswith("test_slow")]:
+            del sys.modules[name]
+
+
+def test_sharded_inprocess_suite_keeps_subprocess_path(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    validator = _load_validator()
+    calls: list[list[str]] = []
+
+    def _fake_stream(command: list[str], timeout_seconds: int, cwd: Path):
+        calls.append(command)
+        return 5, [], ""
+
+    (tmp_path / "probe_tests").mkdir()
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(validator.SUITE_EXEC_MODE, "probe", "inproc")
+    monkeypatch.setattr(validator, "resolve_python_executable", lambda: sys.executable)
+    monkeypatch.setattr(validator, "_stream_pytest", _fake_stream)
+    monkeypatch.setattr(validator, "_run_pytest_inprocess", lambda *args: pytest.fail("ran in-process"))
+
+    validator.run_pytest_suite(validator.SectionLog(), "probe", "probe_tests", tmp_path)
+
+    [command] = calls
+    assert "-n" in command